@@ -0,0 +1,57 @@
+import threading
+from contextlib import contextmanager
+
+
+class ServiceOverloaded(Exception):
+    """Raised when an analysis request arrives while the worker's queue is full."""
+
+
+class AdmissionGate:
+    """
+    Bounds the work a single worker process accepts.
+
+    At most `concurrency` analyses run at once; up to `queue_size` more wait for
+    a slot. Anything beyond that is rejected immediately with ServiceOverloaded,
+    so callers can answer 503 instead of piling up sockets behind a busy worker.
+    A waiting request that cannot start within `queue_timeout` seconds is
+    rejected as well.
+    """
+
+    def __init__(self, concurrency=1, queue_size=4, queue_timeout=None):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.admitted = 0  # Running plus waiting
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def admit(self):
+        with self._lock:
+            if self.admitted >= self.concurrency + self.queue_size:
+                self.rejected += 1
+                raise ServiceOverloaded()
+            self.admitted += 1
+        try:
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                with self._lock:
+                    self.rejected += 1
+                raise ServiceOverloaded()
+            try:
+                yield
+            finally:
+                self._slots.release()
+        finally:
+            with self._lock:
+                self.admitted -= 1
+
+    def stats(self):
+        running = min(self.admitted, self.concurrency)
+        return {
+            "concurrency": self.concurrency,
+            "queue_size": self.queue_size,
+            "running": running,
+            "waiting": self.admitted - running,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def exact_best_matches(queries, keys, block_size=1024):
+    """
+    Exact best match (index and cosine score) in `keys` for every row of `queries`.
+    Both inputs must be unit-length rows. Queries are processed in blocks, so at most
+    block_size x len(keys) similarities exist at once instead of the full matrix.
+    Ties go to the lowest key index, as with argmax over the full matrix.
+    """
+    best_indices = np.zeros(len(queries), dtype=np.int64)
+    best_scores = np.zeros(len(queries), dtype=np.float32)
+    for start in range(0, len(queries), block_size):
+        block = queries[start:start + block_size] @ keys.T
+        best_indices[start:start + block_size] = block.argmax(axis=1)
+        best_scores[start:start + block_size] = block.max(axis=1)
+    return best_indices, best_scores
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index over unit-length vectors.
+
+    The vectors are clustered with spherical k-means; a query only scans the
+    members of its n_probe closest clusters, so similarities are computed for a
+    fraction of the keys and the full query x key matrix is never built.
+    """
+
+    def __init__(self, keys, n_lists=None, n_probe=8, iterations=10, seed=0, sample_per_list=32):
+        self.keys = np.ascontiguousarray(keys, dtype=np.float32)
+        count = len(self.keys)
+        self.n_lists = max(1, min(n_lists or int(np.sqrt(count)), count))
+        self.n_probe = max(1, min(n_probe, self.n_lists))
+        self.centroids = self._train(iterations, np.random.default_rng(seed), sample_per_list)
+
+        assignments = self._assign(self.keys)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(self.n_lists + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.n_lists)]
+
+    def _assign(self, vectors, block_size=4096):
+        assignments = np.zeros(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), block_size):
+            assignments[start:start + block_size] = (vectors[start:start + block_size] @ self.centroids.T).argmax(axis=1)
+        return assignments
+
+    def _train(self, iterations, rng, sample_per_list):
+        # Centroids are trained on a sample; every key is assigned afterwards
+        sample_size = min(len(self.keys), self.n_lists * sample_per_list)
+        sample = self.keys[rng.choice(len(self.keys), sample_size, replace=False)]
+        self.centroids = sample[:self.n_lists].copy()
+        for _ in range(iterations):
+            assignments = self._assign(sample)
+            counts = np.bincount(assignments, minlength=self.n_lists)
+            # Per-cluster sums via one sort + reduceat (much faster than np.add.at)
+            order = np.argsort(assignments, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            sums = np.zeros_like(self.centroids)
+            filled = counts > 0
+            sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+            # Re-seed empty clusters with random keys
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self.centroids = sums / norms
+        return self.centroids
+
+    def search_best(self, queries):
+        """Approximate best match (index and cosine score) in the keys for every query row."""
+        queries = np.asarray(queries, dtype=np.float32)
+        best_indices = np.zeros(len(queries), dtype=np.int64)
+        best_scores = np.full(len(queries), -np.inf, dtype=np.float32)
+        if not len(queries):
+            return best_indices, best_scores
+
+        centroid_scores = queries @ self.centroids.T
+        if self.n_probe < self.n_lists:
+            probes = np.argpartition(-centroid_scores, self.n_probe - 1, axis=1)[:, :self.n_probe]
+        else:
+            probes = np.tile(np.arange(self.n_lists), (len(queries), 1))
+
+        for list_id, members in enumerate(self.lists):
+            if not len(members):
+                continue
+            query_ids = np.flatnonzero((probes == list_id).any(axis=1))
+            if not len(query_ids):
+                continue
+            scores = queries[query_ids] @ self.keys[members].T
+            local = scores.argmax(axis=1)
+            local_scores = scores[np.arange(len(query_ids)), local]
+            candidates = members[local]
+            # Same tie-breaking as exact search: higher score, then lower key index
+            better = (local_scores > best_scores[query_ids]) | (
+                (local_scores == best_scores[query_ids]) & (candidates < best_indices[query_ids])
+            )
+            best_scores[query_ids[better]] = local_scores[better]
+            best_indices[query_ids[better]] = candidates[better]
+
+        # Queries whose probed lists were all empty get no match
+        best_scores[np.isinf(best_scores)] = 0.0
+        return best_indices, best_scores
@@ -1,57 +1,374 @@
 import os
-import io
 import re
+import json
+import time
 import logging
-from flask import Flask, request, jsonify
+import zipfile
+import functools
+import threading
+from concurrent.futures import FIRST_COMPLETED, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack, contextmanager
+from flask import Flask, Request, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import spacy
-from pdfminer.high_level import extract_text as extract_text_from_pdf
-from docx import Document
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from admission import AdmissionGate, ServiceOverloaded
+from ann import IVFIndex, exact_best_matches
+from jobs import JobManager
+from metrics import SIZE_BUCKETS, MetricsRegistry
+from caches import EmbeddingCache, LRUCache, SQLiteStore, TieredCache, hash_bytes, normalize_phrase
+from resume_index import ResumeIndex
+from format_rules import EMAIL_PATTERN, FormatRuleEngine, ParsedResume, default_rules, load_pattern_rules
+from models import LazyModel
+from batching import EncodeBatcher
+from keywords import KeywordCanonicalizer
+from text_extraction import ExtractionPool, extract_document_text, resolve_pdf_backends
 
 # Set up basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+class UploadRequest(Request):
+    """Request whose body size limit is BULK_MAX_UPLOAD_MB on the bulk route and MAX_UPLOAD_MB elsewhere."""
+
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'analyze_resume_jd_bulk':
+            return BULK_MAX_UPLOAD_BYTES
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app) # Enable CORS for all routes
+# Larger uploads are rejected with 413 before they are read
+app.config['MAX_CONTENT_LENGTH'] = int(float(os.environ.get('MAX_UPLOAD_MB', '10')) * 1024 * 1024)
+BULK_MAX_UPLOAD_BYTES = int(float(os.environ.get('BULK_MAX_UPLOAD_MB', '200')) * 1024 * 1024)
+
+# Models are loaded on first use, so the process starts (and answers health checks) without
+# importing spaCy or torch. MODEL_WARMUP=1 loads them at import instead (gunicorn.conf.py does
+# this in the master so workers share them), and MODEL_WARMUP=background loads them in a
+# background thread; /ready reports when they are loaded and POST /warmup loads them on demand.
+MODEL_WARMUP = os.environ.get('MODEL_WARMUP', '0')
+
+# spaCy model
+SPACY_MODEL_NAME = 'en_core_web_sm' # Use a small model for general NLP tasks
+# Keyword extraction only needs POS tags and noun chunks (tok2vec, tagger, parser,
+# attribute_ruler), so the unused components are not loaded at all
+SPACY_EXCLUDE = [name.strip() for name in os.environ.get('SPACY_EXCLUDE', 'ner,lemmatizer').split(',') if name.strip()]
+SPACY_BATCH_SIZE = int(os.environ.get('SPACY_BATCH_SIZE', '32'))
+SPACY_N_PROCESS = int(os.environ.get('SPACY_N_PROCESS', '1'))
+
+def load_spacy_model():
+    import spacy
+    try:
+        model = spacy.load(SPACY_MODEL_NAME, exclude=SPACY_EXCLUDE)
+    except OSError:
+        logging.error(f"Please ensure the spaCy model is downloaded (python -m spacy download {SPACY_MODEL_NAME}).")
+        raise
+    logging.info(f"spaCy model '{SPACY_MODEL_NAME}' loaded successfully (pipeline: {', '.join(model.pipe_names)}).")
+    return model
+
+nlp = LazyModel("spaCy model", load_spacy_model)
+
+# Local state (SQLite stores, indexes) lives in the Flask instance folder by default
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+
+# Sentence-BERT model for semantic similarity
+# 'all-MiniLM-L6-v2' is a good balance of size and performance
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+def load_sentence_model():
+    """Loads the Sentence-BERT model on first use."""
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        model = SentenceTransformer(SENTENCE_MODEL_NAME)
+    except Exception:
+        logging.error("Please ensure you have internet access for the first run (the Sentence-BERT model is downloaded once).")
+        raise
+    logging.info(f"Sentence-BERT model '{SENTENCE_MODEL_NAME}' loaded successfully.")
+    return model
+
+sentence_model = LazyModel("Sentence-BERT model", load_sentence_model)
+
+# Skill dictionary (canonical names + aliases), action verbs and excluded keywords,
+# compiled once into phrase matchers shared by keyword extraction, format checks and parsing
+SKILL_TAXONOMY_PATH = os.environ.get(
+    'SKILL_TAXONOMY_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skill_taxonomy.json')
+)
+
+def load_skill_taxonomy():
+    from skills import SkillTaxonomy  # Imports spaCy
+
+    taxonomy = SkillTaxonomy.load(SKILL_TAXONOMY_PATH, nlp.get())
+    logging.info(f"Skill taxonomy loaded with {len(taxonomy)} skills from '{SKILL_TAXONOMY_PATH}'.")
+    return taxonomy
+
+skill_taxonomy = LazyModel("skill taxonomy", load_skill_taxonomy)
+
+# Keyword canonicalization before embedding (keywords.py). 'on' merges the plural, alias and
+# filler-word variants of a keyword, lets a skill stand for the noun chunks that mention it and
+# keeps the KEYWORD_MAX most salient keywords of each resume and JD (0 keeps all); 'report' keeps
+# every candidate but counts what 'on' would drop (keywords_dropped_total); 'off' is neither
+KEYWORD_CANONICALIZATION = os.environ.get('KEYWORD_CANONICALIZATION', 'off')
+keyword_canonicalizer = KeywordCanonicalizer(skill_taxonomy.get, int(os.environ.get('KEYWORD_MAX', '200')))
+
+# Loaded by /warmup and MODEL_WARMUP, in this order, and reported by /ready
+MODELS = {"spacy": nlp, "sentence_model": sentence_model, "skill_taxonomy": skill_taxonomy}
+
+def models_ready():
+    """
+    True if every model is loaded. Artifacts and results computed while one failed to
+    load are degraded (no keywords or no embeddings), so they are returned but not cached.
+    """
+    return all(model.get() is not None for model in MODELS.values())
+
+# Format checks: the built-in rules plus optional regex rules from FORMAT_RULES_PATH,
+# all compiled at startup and run over one shared parsed view of the resume
+format_rules = default_rules(lambda text: skill_taxonomy.get().find_action_verbs(text))
+if os.environ.get('FORMAT_RULES_PATH'):
+    format_rules += load_pattern_rules(os.environ['FORMAT_RULES_PATH'])
+format_engine = FormatRuleEngine(format_rules)
+
+# PDF text extraction reads page by page and stops at the first exhausted budget
+# (pages, characters or wall-clock seconds); 0 disables a limit
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '20'))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', '200000'))
+PDF_TIMEOUT = float(os.environ.get('PDF_TIMEOUT', '10'))
+# PDF_TIMEOUT is checked between pages, so one pathological page can still run on. Bulk uploads
+# are extracted in worker processes that are killed after EXTRACTION_TIMEOUT seconds (default
+# PDF_TIMEOUT + 5, so the page-level limit normally stops first; 0 disables the limit). Single
+# uploads are extracted in the request thread unless EXTRACT_WORKERS > 0 opts them into a
+# process pool with the same hard limit, at the cost of copying each upload to a worker
+EXTRACTION_TIMEOUT = float(os.environ.get('EXTRACTION_TIMEOUT', str(PDF_TIMEOUT + 5 if PDF_TIMEOUT else 0)))
+EXTRACT_WORKERS = int(os.environ.get('EXTRACT_WORKERS', '0'))
+extraction_pool = ExtractionPool(max_workers=EXTRACT_WORKERS) if EXTRACT_WORKERS else None
+PDF_BACKENDS = resolve_pdf_backends(os.environ.get('PDF_BACKEND', 'auto'))
+logging.info(f"PDF text extraction backends: {', '.join(PDF_BACKENDS)}.")
+
+# Keyword embedding cache: in-process LRU, plus an optional SQLite file shared by workers
+embedding_cache = EmbeddingCache(
+    SENTENCE_MODEL_NAME,
+    maxsize=int(os.environ.get('EMBEDDING_CACHE_SIZE', '20000')),
+    path=os.environ.get('EMBEDDING_CACHE_PATH') or None
+)
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm") # Use a small model for general NLP tasks
-    logging.info("spaCy model 'en_core_web_sm' loaded successfully.")
-except Exception as e:
-    logging.error(f"Error loading spaCy model: {e}. Please ensure it's downloaded (python -m spacy download en_core_web_sm).")
-    nlp = None
-
-# Load Sentence-BERT model for semantic similarity
-try:
-    # 'all-MiniLM-L6-v2' is a good balance of size and performance
-    sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-    logging.info("Sentence-BERT model 'all-MiniLM-L6-v2' loaded successfully.")
-except Exception as e:
-    logging.error(f"Error loading Sentence-BERT model: {e}. Please ensure you have internet access for first run.")
-    sentence_model = None
+# Resume keywords are extracted span by span (so revisions can reuse unchanged spans) only
+# with INCREMENTAL_REANALYSIS; spans lose sentence context, so keywords and scores can differ
+# from the default whole-document extraction
+INCREMENTAL_REANALYSIS = os.environ.get('INCREMENTAL_REANALYSIS', '0') == '1'
+# Paragraphs longer than this many lines are split into lines for keyword extraction
+RESUME_SPAN_MAX_LINES = int(os.environ.get('RESUME_SPAN_MAX_LINES', '8'))
+
+# Full-response cache for repeated resume/JD pairs; the version string is part of every key
+# /4: DOCX text includes tables, text boxes, headers and footers (streaming OOXML reader)
+ANALYSIS_VERSION = f"{SPACY_MODEL_NAME}/{SENTENCE_MODEL_NAME}/4"
+if os.environ.get('FORMAT_RULES_PATH'):
+    # Extra format rules change scores, so they are part of the version too
+    with open(os.environ['FORMAT_RULES_PATH'], 'rb') as rules_file:
+        ANALYSIS_VERSION += "/" + hash_bytes(rules_file.read())[:12]
+# Backends extract slightly different text, and the limits decide how much of it is kept
+ANALYSIS_VERSION += f"/{PDF_BACKENDS[0]}:{PDF_MAX_PAGES}:{PDF_MAX_CHARS}"
+if KEYWORD_CANONICALIZATION != 'off':
+    # 'report' scores like 'off' but caches resume spans in the canonicalization format
+    ANALYSIS_VERSION += f"/keywords:{KEYWORD_CANONICALIZATION}:{keyword_canonicalizer.max_keywords}"
+if INCREMENTAL_REANALYSIS:
+    ANALYSIS_VERSION += f"/spans:{RESUME_SPAN_MAX_LINES}"
+result_cache = TieredCache(
+    maxsize=int(os.environ.get('RESULT_CACHE_SIZE', '512')),
+    ttl=int(os.environ.get('RESULT_CACHE_TTL', '3600')),
+    path=os.environ.get('RESULT_CACHE_PATH') or None,
+    table="results"
+)
+
+# Per-resume artifact cache (text, keywords, embeddings, format and structured data),
+# keyed by the hash of the uploaded file so the same resume is parsed only once. The key is
+# returned as the analysisId; with INCREMENTAL_REANALYSIS, a revised upload that sends it back
+# as previousAnalysisId only re-parses the spans (paragraphs) that changed
+resume_cache = TieredCache(
+    maxsize=int(os.environ.get('RESUME_CACHE_SIZE', '256')),
+    path=os.environ.get('RESUME_CACHE_PATH') or None,
+    table="resume_artifacts",
+    max_bytes=int(os.environ.get('RESUME_CACHE_MAX_MB', '512')) * 1024 * 1024
+)
+
+# Registered job descriptions with precomputed keywords and embeddings, shared by all workers
+job_description_store = TieredCache(
+    maxsize=int(os.environ.get('JD_STORE_CACHE_SIZE', '1024')),
+    path=os.environ.get('JD_STORE_PATH', os.path.join(INSTANCE_DIR, 'job_descriptions.sqlite')),
+    table="job_descriptions"
+)
+
+# Per-worker admission control: ANALYSIS_CONCURRENCY analyses run at once, ANALYSIS_QUEUE_SIZE
+# more may wait, and further requests get 503 with Retry-After (see gunicorn.conf.py)
+analysis_gate = AdmissionGate(
+    concurrency=int(os.environ.get('ANALYSIS_CONCURRENCY', '1')),
+    queue_size=int(os.environ.get('ANALYSIS_QUEUE_SIZE', '4')),
+    queue_timeout=float(os.environ.get('ANALYSIS_QUEUE_TIMEOUT', '30'))
+)
+ANALYSIS_RETRY_AFTER = os.environ.get('ANALYSIS_RETRY_AFTER', '2')
+
+# Asynchronous analysis jobs: a background pool per worker, with status and results kept
+# in a local SQLite store (shared by all workers) that expires them after ASYNC_JOB_TTL seconds
+job_manager = JobManager(
+    SQLiteStore(
+        os.environ.get('ASYNC_JOB_STORE_PATH', os.path.join(INSTANCE_DIR, 'jobs.sqlite')),
+        table="jobs",
+        ttl=int(os.environ.get('ASYNC_JOB_TTL', '3600'))
+    ),
+    max_workers=int(os.environ.get('ASYNC_JOB_WORKERS', '1')),
+    max_pending=int(os.environ.get('ASYNC_JOB_QUEUE_SIZE', '32'))
+)
+
+# Bulk uploads (/analyze-resume-jd-bulk): text extraction runs in a process pool, created on
+# first use, and the extracted resumes go through keyword extraction and embedding in batches
+BULK_EXTRACT_WORKERS = int(os.environ.get('BULK_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 1))))
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', '16'))
+BULK_MAX_FILES = int(os.environ.get('BULK_MAX_FILES', '500'))
+bulk_extraction_pool = ExtractionPool(max_workers=BULK_EXTRACT_WORKERS)
+
+# On-disk index of analyzed resumes for reverse (JD -> top resumes) search
+RESUME_INDEX_ENABLED = os.environ.get('RESUME_INDEX_ENABLED', '0') == '1'
+resume_index = ResumeIndex(os.environ.get('RESUME_INDEX_DIR', os.path.join(INSTANCE_DIR, 'resume_index')))
+# Resumes re-ranked keyword by keyword per search (at least 10 per requested result)
+RESUME_SEARCH_SHORTLIST = int(os.environ.get('RESUME_SEARCH_SHORTLIST', '1000'))
+
+# Prometheus metrics of this worker process, served at /metrics
+metrics = MetricsRegistry(namespace="ai_service")
+stage_duration = metrics.histogram(
+    "stage_duration_seconds", "Duration of analysis pipeline stages.", labelnames=("stage",)
+)
+request_duration = metrics.histogram(
+    "request_duration_seconds", "HTTP request duration by endpoint.", labelnames=("endpoint",)
+)
+requests_total = metrics.counter(
+    "requests_total", "HTTP requests by endpoint and status code.", labelnames=("endpoint", "status")
+)
+text_length = metrics.histogram(
+    "text_length_chars", "Length of analyzed resume and job description texts.", SIZE_BUCKETS, ("source",)
+)
+keyword_count = metrics.histogram(
+    "keywords_extracted", "Keywords matched per resume and job description.", SIZE_BUCKETS, ("source",)
+)
+keyword_candidates = metrics.counter(
+    "keyword_candidates_total", "Keyword candidates found before canonicalization (KEYWORD_CANONICALIZATION)."
+)
+keywords_dropped = metrics.counter(
+    "keywords_dropped_total", "Keyword candidates dropped (or, in report mode, that would be) by reason.", ("reason",)
+)
+similarity_cells = metrics.histogram(
+    "similarity_matrix_cells", "Resume keywords x JD keywords compared per match.", SIZE_BUCKETS
+)
+CACHES = {
+    "embedding": embedding_cache,
+    "result": result_cache,
+    "resume": resume_cache,
+    "job_description": job_description_store,
+}
+metrics.gauge(
+    "cache_entries", "Entries in the in-process cache tier.",
+    lambda: [({"cache": name}, cache.stats()["memory_size"]) for name, cache in CACHES.items()], ("cache",)
+)
+metrics.counter_callback(
+    "cache_hits_total", "Cache hits by cache and tier.",
+    lambda: [({"cache": name, "tier": tier}, cache.stats()[f"{tier}_hits"])
+             for name, cache in CACHES.items() for tier in ("memory", "disk")], ("cache", "tier")
+)
+metrics.counter_callback(
+    "cache_misses_total", "Cache misses by cache.",
+    lambda: [({"cache": name}, cache.stats()["misses"]) for name, cache in CACHES.items()], ("cache",)
+)
+metrics.gauge(
+    "model_loaded", "1 if the model is loaded in this worker.",
+    lambda: [({"model": name}, int(model.loaded)) for name, model in MODELS.items()], ("model",)
+)
+metrics.gauge("analyses_running", "Analyses currently running in this worker.", lambda: analysis_gate.stats()["running"])
+metrics.gauge("analyses_waiting", "Analyses waiting for the admission gate.", lambda: analysis_gate.stats()["waiting"])
+metrics.counter_callback(
+    "analyses_rejected_total", "Requests rejected with 503 by the admission gate.", lambda: analysis_gate.stats()["rejected"]
+)
+metrics.counter_callback(
+    "format_rule_seconds_total", "Time spent in each format rule.",
+    lambda: [({"rule": rule["name"]}, rule["total_ms"] / 1000) for rule in format_engine.stats()], ("rule",)
+)
+metrics.counter_callback(
+    "format_rule_issues_total", "Issues reported by each format rule.",
+    lambda: [({"rule": rule["name"]}, rule["issues"]) for rule in format_engine.stats()], ("rule",)
+)
+metrics.gauge("async_jobs_pending", "Queued or running async jobs in this worker.", lambda: job_manager.stats()["queue_depth"])
+metrics.counter_callback(
+    "async_jobs_finished_total", "Finished async jobs by outcome.",
+    lambda: [({"outcome": outcome}, job_manager.stats()[outcome]) for outcome in ("completed", "failed")], ("outcome",)
+)
+
+# Cross-request encode batching: phrases that miss the embedding cache in concurrent analyses
+# are encoded together in one forward pass. A batch is flushed at ENCODE_BATCH_MAX_SIZE phrases,
+# once every analysis running in this worker has queued its phrases, or after ENCODE_BATCH_WAIT_MS
+ENCODE_BATCHING = os.environ.get('ENCODE_BATCHING', '1') == '1'
+encode_batch_requests = metrics.histogram(
+    "encode_batch_requests", "Encode calls merged into one model call.", (1, 2, 4, 8, 16, 32, 64)
+)
+encode_batch_phrases = metrics.histogram(
+    "encode_batch_phrases", "Distinct phrases encoded per model call.", (1, 8, 32, 64, 128, 256, 512, 1024)
+)
+encode_queue_wait = metrics.histogram(
+    "encode_queue_wait_seconds", "Time an encode call waited for its batch to start.",
+    (0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+
+def record_encode_batch(requests, phrases, queue_waits):
+    encode_batch_requests.observe(requests)
+    encode_batch_phrases.observe(phrases)
+    for queue_wait in queue_waits:
+        encode_queue_wait.observe(queue_wait)
+
+def expected_encode_callers():
+    """Analyses that may be encoding right now in this worker: gated requests plus running async jobs."""
+    jobs = job_manager.stats()
+    return analysis_gate.stats()["running"] + min(jobs["queue_depth"], jobs["workers"])
+
+encode_batcher = EncodeBatcher(
+    sentence_model.get,
+    max_batch_size=int(os.environ.get('ENCODE_BATCH_MAX_SIZE', '256')),
+    max_wait=float(os.environ.get('ENCODE_BATCH_WAIT_MS', '5')) / 1000,
+    expected_callers=expected_encode_callers,
+    on_batch=record_encode_batch
+)
+
+def keyword_encoder():
+    """What embedding_cache.encode runs missing phrases through: the shared batcher, or the model itself."""
+    return encode_batcher if ENCODE_BATCHING else sentence_model.get()
 
 # --- Helper Functions for Text Extraction ---
+def extract_document(file_bytes, file_extension):
+    """
+    Extracts text from PDF or DOCX bytes within the configured PDF limits.
+    Returns (text, info), where info has the backend, pages read, total pages and
+    the truncation reason, or (None, None) if the file could not be read.
+    """
+    if file_extension not in ('.pdf', '.docx'):
+        return None, None
+    try:
+        if extraction_pool is not None and EXTRACTION_TIMEOUT:
+            info = extraction_pool.run(EXTRACTION_TIMEOUT, extract_document_text, file_bytes, file_extension,
+                                       **pdf_extraction_limits())
+        else:
+            info = extract_document_text(file_bytes, file_extension, **pdf_extraction_limits())
+    except FutureTimeoutError:
+        logging.error(f"{file_extension[1:].upper()} text extraction stopped after EXTRACTION_TIMEOUT={EXTRACTION_TIMEOUT}s")
+        return None, None
+    except Exception as e:
+        logging.error(f"{file_extension[1:].upper()} text extraction error: {e}")
+        return None, None
+    if info["truncated"]:
+        logging.warning(f"PDF text truncated ({info['truncated']}) after {info['pages']} of {info['total_pages']} pages")
+    return info.pop("text"), info
+
+def pdf_extraction_limits():
+    return {"max_pages": PDF_MAX_PAGES, "max_chars": PDF_MAX_CHARS, "timeout": PDF_TIMEOUT, "backends": PDF_BACKENDS}
+
 def extract_text_from_doc(file_stream, file_extension):
     """Extracts text from PDF or DOCX file streams."""
-    if file_extension == '.pdf':
-        try:
-            return extract_text_from_pdf(file_stream)
-        except Exception as e:
-            logging.error(f"PDF text extraction error: {e}")
-            return None
-    elif file_extension == '.docx':
-        try:
-            document = Document(file_stream)
-            return "\n".join([paragraph.text for paragraph in document.paragraphs])
-        except Exception as e:
-            logging.error(f"DOCX text extraction error: {e}")
-            return None
-    else:
-        return None
+    return extract_document(file_stream.read(), file_extension)[0]
 
 # --- Advanced Skill/Keyword Extraction (Improved) ---
 def extract_keywords_from_text(text, nlp_model):
@@ -59,10 +376,40 @@ def extract_keywords_from_text(text, nlp_model):
     Extracts potential keywords/skills from text using spaCy and simple heuristics.
     For production, consider a predefined skill dictionary or a custom NER model.
     """
-    if not nlp_model or not text:
-        return []
+    return extract_keywords_from_texts([text], nlp_model)[0]
+
+def extract_keywords_from_texts(texts, nlp_model, batch_size=None, n_process=None, as_spans=False):
+    """
+    Batched extract_keywords_from_text: runs all non-empty texts through one nlp.pipe
+    call (SPACY_BATCH_SIZE / SPACY_N_PROCESS by default). Returns one keyword list per text.
+    With as_spans, the texts are parts of one document (resume spans); see keywords_from_doc.
+    """
+    results = [[] for _ in texts]
+    if not nlp_model:
+        return results
 
-    doc = nlp_model(text.lower())
+    indices = [i for i, text in enumerate(texts) if text]
+    docs = nlp_model.pipe(
+        (texts[i].lower() for i in indices),
+        batch_size=batch_size or SPACY_BATCH_SIZE,
+        n_process=n_process or SPACY_N_PROCESS
+    )
+    for i, doc in zip(indices, docs):
+        results[i] = keywords_from_doc(doc, as_spans)
+    return results
+
+def keywords_from_doc(doc, as_span=False):
+    """
+    Keyword heuristics over one parsed (lowercased) spaCy doc. With keyword canonicalization
+    on (or in report mode), a span of a larger document gets {"keywords": canonical keywords,
+    "candidates": raw candidates}, neither capped nor counted: merge_span_keywords does that
+    once for the whole document.
+    """
+    if KEYWORD_CANONICALIZATION != 'off':
+        keywords, raw = keyword_canonicalizer.keywords(doc)
+        if as_span:
+            return {"keywords": keywords, "candidates": sorted(raw)}
+        return canonical_keywords(keywords, raw)
     keywords = set()
 
     # Rule-based extraction (can be expanded significantly)
@@ -74,44 +421,63 @@ def extract_keywords_from_text(text, nlp_model):
     for token in doc:
         if token.pos_ in ["NOUN", "PROPN"] and len(token.text) > 2 and not token.is_stop and token.is_alpha:
             keywords.add(token.text)
-        # Add common programming languages/tools that might not be simple nouns
-        if token.text in ["python","django", "java", "javascript", "react", "node", "sql", "aws", "azure", "gcp", "docker", "kubernetes", "git", "linux","react.js", "agile", "scrum", "devops","back-end","front-end","vue","PostgreSQL","mysql","mongodb"]:
-             keywords.add(token.text)
-
-    # Clean and filter common non-skill words (expand this list!)
-    common_words_to_exclude = {
-        "experience", "management", "project", "system", "data", "developer", "engineer","team members","enviroments","tests","test","service"
-        "lead", "team", "master", "university", "college","features","exam","examination", "certification", "certifications",
-        "solution", "role", "work", "responsibilities", "skills","new features","basic understanding","stand","knowledgeable", "expertise", "familiarity",
-        "ability", "strong", "proven", "excellent", "knowledge", "understanding", "experience with","institute","end","unit",
-    }
+
+    # Add programming languages/tools from the skill taxonomy that might not be simple nouns
+    for surface_text, _ in skill_taxonomy.get().find_skills(doc):
+        keywords.add(surface_text)
+
+    # Clean and filter common non-skill words (excluded_keywords in the skill taxonomy)
+    excluded_keywords = skill_taxonomy.get().excluded_keywords
     filtered_keywords = [
         kw for kw in sorted(list(keywords))
-        if kw not in common_words_to_exclude and len(kw) > 1 and not re.search(r'\d', kw) # exclude numbers
+        if kw not in excluded_keywords and len(kw) > 1 and not re.search(r'\d', kw) # exclude numbers
     ]
     return list(set(filtered_keywords)) # Return as list of unique keywords
 
-# --- Semantic Similarity Matching ---
-def calculate_semantic_similarity(texts1, texts2, model):
+def canonical_keywords(keywords, raw):
     """
-    Calculates cosine similarity between two lists of texts using Sentence-BERT.
-    Returns a similarity matrix.
+    A whole document's keywords from its ranked canonical keywords and raw candidates:
+    the KEYWORD_MAX most salient canonical keywords with KEYWORD_CANONICALIZATION=on,
+    the raw candidates with 'report'. Either way the candidates merged away or cut by
+    KEYWORD_MAX are counted.
     """
-    if not model:
-        return np.array([[0.0]]) # Return a default if model not loaded
-
-    embeddings1 = model.encode(texts1, convert_to_tensor=False)
-    embeddings2 = model.encode(texts2, convert_to_tensor=False)
+    keyword_candidates.inc(len(raw))
+    keywords_dropped.inc(max(len(raw) - len(keywords), 0), reason="canonical")
+    kept = keyword_canonicalizer.cap(keywords)
+    keywords_dropped.inc(len(keywords) - len(kept), reason="cap")
+    return kept if KEYWORD_CANONICALIZATION == 'on' else list(raw)
 
-    # Handle cases where one list might be empty
-    if len(embeddings1) == 0 or len(embeddings2) == 0:
-        return np.array([[0.0]])
+def merge_span_keywords(span_results):
+    """canonical_keywords of a document from the keywords_from_doc results of its spans."""
+    span_results = list(span_results)
+    raw = list(dict.fromkeys(keyword for result in span_results for keyword in result["candidates"]))
+    return canonical_keywords(keyword_canonicalizer.merge([result["keywords"] for result in span_results]), raw)
 
-    return cosine_similarity(embeddings1, embeddings2)
+# --- Semantic Similarity Matching ---
+def normalize_embeddings(embeddings):
+    """Scales each embedding row to unit length (zero rows are left as zeros)."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
 
 # --- Main Analysis Function ---
-def perform_job_matching(resume_text, job_description_text):
-    if not nlp or not sentence_model:
+# Define a similarity threshold for a "match"
+MATCH_THRESHOLD = 0.6 # Adjust this based on desired strictness
+
+# Keyword matching mode: 'exact' (default) or 'approximate' (IVF index for large JD keyword sets)
+MATCH_MODE = os.environ.get('MATCH_MODE', 'exact')
+ANN_MIN_KEYWORDS = int(os.environ.get('ANN_MIN_KEYWORDS', '256'))
+ANN_N_PROBE = int(os.environ.get('ANN_N_PROBE', '8'))
+ann_index_cache = LRUCache(maxsize=64)
+
+def perform_job_matching(resume_text, job_description_text, resume_keywords=None, resume_embeddings=None,
+                         jd_keywords=None, jd_embeddings=None, timings=None):
+    """
+    Matches resume keywords against JD keywords. Precomputed keywords and normalized
+    embeddings (from the resume artifact cache or a registered JD) skip that side's work.
+    """
+    if not nlp.get() or not sentence_model.get():
         return {
             "matchScore": 0.0,
             "matched_details": [],
@@ -119,8 +485,21 @@ def perform_job_matching(resume_text, job_description_text):
         }
 
     # 1. Extract keywords/skills from Resume and Job Description
-    resume_keywords = extract_keywords_from_text(resume_text, nlp)
-    jd_keywords = extract_keywords_from_text(job_description_text, nlp)
+    if resume_keywords is None and jd_keywords is None:
+        # Neither side is precomputed. One document per batch: batching a long resume with a long JD
+        # held both in memory (1.8x peak RSS) without being faster (benchmarks/bench_spacy.py)
+        with stage_timer(timings, "keywords"):
+            resume_keywords, jd_keywords = extract_keywords_from_texts(
+                [resume_text, job_description_text], nlp.get(), batch_size=1
+            )
+    elif resume_keywords is None:
+        with stage_timer(timings, "resume_keywords"):
+            resume_keywords = extract_keywords_from_text(resume_text, nlp.get())
+    elif jd_keywords is None:
+        with stage_timer(timings, "jd_keywords"):
+            jd_keywords = extract_keywords_from_text(job_description_text, nlp.get())
+    keyword_count.observe(len(resume_keywords), source="resume")
+    keyword_count.observe(len(jd_keywords), source="job_description")
 
     # If no keywords are found, return early
     if not jd_keywords:
@@ -138,34 +517,47 @@ def perform_job_matching(resume_text, job_description_text):
 
     # 2. Semantic Similarity Calculation
     # We'll match each resume keyword against all JD keywords
-    similarity_matrix = calculate_semantic_similarity(resume_keywords, jd_keywords, sentence_model)
+    if resume_embeddings is None:
+        with stage_timer(timings, "resume_embeddings"):
+            resume_embeddings = normalize_embeddings(embedding_cache.encode(resume_keywords, keyword_encoder()))
+    if jd_embeddings is None:
+        with stage_timer(timings, "jd_embeddings"):
+            jd_embeddings = normalize_embeddings(embedding_cache.encode(jd_keywords, keyword_encoder()))
+    similarity_cells.observe(len(resume_keywords) * len(jd_keywords))
+    with stage_timer(timings, "similarity"):
+        best_jd_indices, best_match_scores = find_best_matches(resume_embeddings, jd_embeddings, jd_keywords)
 
     # 3. Aggregate Matching Details and Score
-    matched_details = []
-    total_score = 0.0
-    matched_jd_keywords = set() # To track which JD keywords were matched
-
-    for i, res_kw in enumerate(resume_keywords):
-        best_match_score = 0.0
-        best_jd_kw = ""
-        
-        # Find the best matching JD keyword for each resume keyword
-        for j, jd_kw in enumerate(jd_keywords):
-            score = similarity_matrix[i, j]
-            if score > best_match_score:
-                best_match_score = score
-                best_jd_kw = jd_kw
-        
-        # Define a similarity threshold for a "match"
-        match_threshold = 0.6 # Adjust this based on desired strictness
-        if best_match_score >= match_threshold:
-            matched_details.append({
-                "resume_keyword": res_kw,
-                "jd_match": best_jd_kw,
-                "similarity_score": round(float(best_match_score), 2)
-            })
-            total_score += best_match_score # Add to overall score
-            matched_jd_keywords.add(best_jd_kw) # Mark JD keyword as matched
+    return aggregate_best_matches(resume_keywords, jd_keywords, best_jd_indices, best_match_scores)
+
+def find_best_matches(resume_embeddings, jd_embeddings, jd_keywords):
+    """
+    Best JD keyword (index and cosine score) for every resume keyword, from unit-length embeddings.
+    Exact mode scans the JD keywords in blocks; approximate mode (MATCH_MODE=approximate)
+    queries an IVF index over large JD keyword sets, so the full matrix is never built.
+    """
+    if MATCH_MODE == 'approximate' and len(jd_embeddings) >= ANN_MIN_KEYWORDS:
+        index_key = hash_bytes(*jd_keywords)
+        ann_index = ann_index_cache.get(index_key)
+        if ann_index is None:
+            ann_index = IVFIndex(jd_embeddings, n_probe=ANN_N_PROBE)
+            ann_index_cache.set(index_key, ann_index)
+        return ann_index.search_best(resume_embeddings)
+
+    return exact_best_matches(resume_embeddings, jd_embeddings)
+
+def aggregate_best_matches(resume_keywords, jd_keywords, best_jd_indices, best_match_scores):
+    """Turns each resume keyword's best JD match into match details and an overall score."""
+    # Keep the resume keywords whose best match clears the similarity threshold
+    matched_indices = np.flatnonzero(best_match_scores >= MATCH_THRESHOLD)
+    matched_details = [
+        {
+            "resume_keyword": resume_keywords[i],
+            "jd_match": jd_keywords[best_jd_indices[i]],
+            "similarity_score": round(float(best_match_scores[i]), 2)
+        }
+        for i in matched_indices
+    ]
 
     # Calculate final match score
     # A simple approach: sum of best match scores, normalized by number of JD keywords
@@ -184,204 +576,80 @@ def perform_job_matching(resume_text, job_description_text):
         "matched_details": matched_details,
         "resume_keywords_extracted": resume_keywords,
         "jd_keywords_extracted": jd_keywords,
-        "message": "Semantic matching performed. Adjust 'match_threshold' and scoring logic for fine-tuning."
+        "message": "Semantic matching performed. Adjust 'MATCH_THRESHOLD' and scoring logic for fine-tuning."
     }
 
-# --- Resume Format Checking Functions ---
-def check_resume_format(resume_text):
+def perform_batch_job_matching(resume_text, job_description_texts, resume_keywords=None, resume_embeddings=None,
+                               timings=None):
     """
-    Comprehensive resume format checking function.
-    Returns format issues and suggestions for improvement.
+    Scores one resume against many job descriptions.
+    Resume keywords are extracted and embedded once, and the keywords of all
+    job descriptions are embedded together in a single encode call.
+    Returns one result per job description, in the same order.
     """
-    format_issues = []
-    format_score = 100  # Start with perfect score, deduct points for issues
-    
-    # Convert to lowercase for case-insensitive checking
-    text_lower = resume_text.lower()
-    
-    # 1. Contact Information Checks
-    contact_issues = check_contact_information(resume_text, text_lower)
-    format_issues.extend(contact_issues)
-    format_score -= len(contact_issues) * 10
-    
-    # 2. Section Structure Checks
-    section_issues = check_section_structure(text_lower)
-    format_issues.extend(section_issues)
-    format_score -= len(section_issues) * 15
-    
-    # 3. Content Quality Checks
-    content_issues = check_content_quality(resume_text, text_lower)
-    format_issues.extend(content_issues)
-    format_score -= len(content_issues) * 8
-    
-    # 4. Professional Formatting Checks
-    formatting_issues = check_professional_formatting(resume_text, text_lower)
-    format_issues.extend(formatting_issues)
-    format_score -= len(formatting_issues) * 5
-    
-    # 5. Length and Structure Checks
-    length_issues = check_length_and_structure(resume_text)
-    format_issues.extend(length_issues)
-    format_score -= len(length_issues) * 12
-    
-    return {
-        "format_score": max(0, format_score),
-        "format_issues": format_issues,
-        "total_issues": len(format_issues)
-    }
+    if not nlp.get() or not sentence_model.get():
+        return [{
+            "matchScore": 0.0,
+            "matched_details": [],
+            "message": "AI models not loaded. Cannot perform full analysis."
+        } for _ in job_description_texts]
 
-def check_contact_information(resume_text, text_lower):
-    """Check for essential contact information."""
-    issues = []
-    
-    # Email check
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    if not re.search(email_pattern, resume_text):
-        issues.append("Missing email address")
-    
-    # Phone number check (various formats)
-    phone_patterns = [
-         r'\(\+\d{1,3}\)\s\d{2}\s\d{7}',  # International format
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-        r'\+?\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',  # International
-        r'\+\d{1,9}\s\d{9}' 
-    ]
-    
-    phone_found = any(re.search(pattern, resume_text) for pattern in phone_patterns)
-    if not phone_found:
-        issues.append("Missing or improperly formatted phone number")
-    
-    # LinkedIn profile check
-    linkedin_patterns = [
-        r'linkedin\.com/in/[\w-]+',
-        r'linkedin\.com/pub/[\w-]+',
-        r'www\.linkedin\.com'
-    ]
-    linkedin_found = any(re.search(pattern, text_lower) for pattern in linkedin_patterns)
-    if not linkedin_found:
-        issues.append("Consider adding LinkedIn profile")
-    
-    return issues
+    # All job descriptions (and the resume, unless precomputed) go through one nlp.pipe call
+    if resume_keywords is None:
+        with stage_timer(timings, "keywords"):
+            resume_keywords, *jd_keywords_list = extract_keywords_from_texts(
+                [resume_text] + list(job_description_texts), nlp.get()
+            )
+    else:
+        with stage_timer(timings, "jd_keywords"):
+            jd_keywords_list = extract_keywords_from_texts(list(job_description_texts), nlp.get())
 
-def check_section_structure(text_lower):
-    """Check for essential resume sections."""
-    issues = []
-    
-    # Essential sections
-    essential_sections = {
-        'experience': ['experience', 'work experience', 'employment', 'professional experience'],
-        'education': ['education', 'academic background', 'qualifications'],
-        'skills': ['skills', 'technical skills', 'competencies', 'technologies']
-    }
-    
-    for section_name, keywords in essential_sections.items():
-        section_found = any(keyword in text_lower for keyword in keywords)
-        if not section_found:
-            issues.append(f"Missing {section_name.title()} section")
-    
-    # Check for objective/summary
-    summary_keywords = ['summary', 'objective', 'profile', 'about']
-    summary_found = any(keyword in text_lower for keyword in summary_keywords)
-    if not summary_found:
-        issues.append("Consider adding a professional summary or objective")
-    
-    return issues
+    if not resume_keywords:
+        return [{
+            "match_score": 0.0,
+            "matched_details": [],
+            "message": "Could not extract keywords from Resume. Please ensure resume is parsable."
+        } for _ in job_description_texts]
 
-def check_content_quality(resume_text, text_lower):
-    """Check content quality and completeness."""
-    issues = []
-    
-    # Check for dates in experience
-    date_patterns = [
-        r'\b(19|20)\d{2}\b',  # Years
-        r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(19|20)\d{2}\b',  # Month Year
-        r'\b\d{1,2}/\d{4}\b'  # MM/YYYY
-    ]
-    
-    date_found = any(re.search(pattern, text_lower) for pattern in date_patterns)
-    if not date_found:
-        issues.append("Missing employment dates - add start and end dates for positions")
-    
-    # Check for action verbs (indicating accomplishments)
-    action_verbs = [
-        'achieved', 'developed', 'implemented', 'managed', 'created', 'improved',
-        'increased', 'reduced', 'led', 'coordinated', 'designed', 'built',
-        'established', 'streamlined', 'optimized', 'delivered'
-    ]
-    
-    action_verb_count = sum(1 for verb in action_verbs if verb in text_lower)
-    if action_verb_count < 3:
-        issues.append("Use more action verbs to describe accomplishments")
-    
-    # Check for quantifiable achievements
-    # number_patterns = [
-    #     r'\d+%',  # Percentages
-    #     r'\$\d+',  # Dollar amounts
-    #     r'\d+\s*(million|thousand|k\b)',  # Large numbers
-    #     r'\d+\s*(years?|months?)'  # Time periods
-    # ]
-    
-    # quantifiable_found = any(re.search(pattern, text_lower) for pattern in number_patterns)
-    # if not quantifiable_found:
-    #     issues.append("Add quantifiable achievements (percentages, dollar amounts, time saved)")
-    
-    return issues
+    # Embed the resume once and every JD keyword in one batch
+    if resume_embeddings is None:
+        with stage_timer(timings, "resume_embeddings"):
+            resume_embeddings = normalize_embeddings(embedding_cache.encode(resume_keywords, keyword_encoder()))
+    all_jd_keywords = [kw for jd_keywords in jd_keywords_list for kw in jd_keywords]
+    with stage_timer(timings, "jd_embeddings"):
+        all_jd_embeddings = embedding_cache.encode(all_jd_keywords, keyword_encoder())
+        if all_jd_keywords:
+            all_jd_embeddings = normalize_embeddings(all_jd_embeddings)
 
-def check_professional_formatting(resume_text, text_lower):
-    """Check professional formatting standards."""
-    issues = []
-    
-    # Check for excessive use of "I"
-    i_count = len(re.findall(r'\bi\b', text_lower))
-    total_sentences = len(re.findall(r'[.!?]+', resume_text))
-    
-    if total_sentences > 0 and i_count / total_sentences > 0.1:
-        issues.append("Avoid first-person pronouns (I, me, my) - use active voice instead")
-    
-    # Check for appropriate capitalization
-    lines = resume_text.split('\n')
-    uncapitalized_lines = 0
-    
-    for line in lines:
-        line = line.strip()
-        if line and len(line) > 3 and line[0].islower():
-            uncapitalized_lines += 1
-    
-    if uncapitalized_lines > len(lines) * 0.2:  # More than 20% of lines
-        issues.append("Inconsistent capitalization - ensure proper sentence case")
-    
-    # Check for excessive punctuation
-    excessive_punct = re.findall(r'[!]{2,}|[?]{2,}|[.]{3,}', resume_text)
-    if excessive_punct:
-        issues.append("Remove excessive punctuation marks")
-    
-    return issues
+    results = []
+    offset = 0
+    for jd_keywords in jd_keywords_list:
+        if not jd_keywords:
+            results.append({
+                "match_score": 0.0,
+                "matched_details": [],
+                "message": "Could not extract keywords from Job Description. Please provide a more detailed JD."
+            })
+            continue
 
-def check_length_and_structure(resume_text):
-    """Check resume length and overall structure."""
-    issues = []
-    
-    # Word count check
-    word_count = len(resume_text.split())
-    
-    if word_count < 200:
-        issues.append("Resume appears too short - add more detail about your experience")
-    elif word_count > 1000:
-        issues.append("Resume may be too long - consider condensing to 1-2 pages")
-    
-    # Line length check (for readability)
-    lines = resume_text.split('\n')
-    long_lines = [line for line in lines if len(line) > 100]
-    
-    if len(long_lines) > len(lines) * 0.3:
-        issues.append("Some lines are too long - break into shorter, readable chunks")
-    
-    # Check for empty lines (spacing issues)
-    empty_lines = sum(1 for line in lines if not line.strip())
-    if empty_lines > len(lines) * 0.4:
-        issues.append("Too many empty lines - optimize spacing for better readability")
-    
-    return issues
+        jd_embeddings = all_jd_embeddings[offset:offset + len(jd_keywords)]
+        offset += len(jd_keywords)
+        keyword_count.observe(len(jd_keywords), source="job_description")
+        similarity_cells.observe(len(resume_keywords) * len(jd_keywords))
+        with stage_timer(timings, "similarity"):
+            best_jd_indices, best_match_scores = find_best_matches(resume_embeddings, jd_embeddings, jd_keywords)
+        results.append(aggregate_best_matches(resume_keywords, jd_keywords, best_jd_indices, best_match_scores))
+
+    return results
+
+# --- Resume Format Checking Functions ---
+def check_resume_format(resume_text, parsed_resume=None):
+    """
+    Comprehensive resume format checking function.
+    Returns format issues and suggestions for improvement.
+    The rules (see format_rules.py) deduct points per issue from a perfect 100.
+    """
+    return format_engine.check(parsed_resume or ParsedResume(resume_text))
 
 def generate_format_suggestions(format_issues):
     """Generate specific suggestions based on format issues."""
@@ -414,20 +682,644 @@ def generate_format_suggestions(format_issues):
     return suggestions
 
 # --- Flask Routes ---
+def admission_controlled(view):
+    """
+    Runs a model-bound route through the worker's admission gate (503 when the queue is full).
+    A streamed response keeps its slot until the stream is finished or closed.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        admission = ExitStack()
+        try:
+            admission.enter_context(analysis_gate.admit())
+        except ServiceOverloaded:
+            response = jsonify({"error": "AI service is busy. Please retry shortly."})
+            response.status_code = 503
+            response.headers['Retry-After'] = ANALYSIS_RETRY_AFTER
+            return response
+
+        try:
+            response = view(*args, **kwargs)
+        except BaseException:
+            admission.close()
+            raise
+        if isinstance(response, Response) and response.is_streamed:
+            response.response = release_when_done(response.response, admission)
+            # Also covers a client that disconnects before the stream starts
+            response.call_on_close(admission.close)
+        else:
+            admission.close()
+        return response
+    return wrapper
+
+def release_when_done(body, admission):
+    with admission:
+        yield from body
+
+STREAM_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+def requested_stream_format(default=None):
+    """
+    'ndjson' or 'sse' when the request asks for a streamed response, through the
+    stream field/query parameter (ndjson, sse or 1) or the Accept header; otherwise default.
+    """
+    value = request.values.get('stream', '').lower()
+    if value in STREAM_MIMETYPES:
+        return value
+    if value in ('1', 'true', 'yes'):
+        return "ndjson"
+    accept = request.headers.get('Accept', '')
+    if STREAM_MIMETYPES["sse"] in accept:
+        return "sse"
+    if STREAM_MIMETYPES["ndjson"] in accept:
+        return "ndjson"
+    return default
+
+def streaming_response(records, stream_format):
+    """
+    Streams an iterable of JSON-serializable records as NDJSON lines or Server-Sent
+    Events (event name = the record's status). Each record is sent as soon as it is
+    produced, so memory is bounded by what the producer holds, not the whole result.
+    """
+    def encode():
+        for item in records:
+            data = json.dumps(item)
+            if stream_format == "sse":
+                yield f"event: {item.get('status', 'message')}\ndata: {data}\n\n"
+            else:
+                yield data + "\n"
+
+    response = Response(encode(), mimetype=STREAM_MIMETYPES[stream_format])
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Ask reverse proxies (nginx) not to buffer the stream
+    return response
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        request_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+        requests_total.inc(endpoint=endpoint, status=response.status_code)
+    return response
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    limit_mb = request.max_content_length / (1024 * 1024)
+    return jsonify({"error": f"Upload is too large (limit {limit_mb:g} MB)"}), 413
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/format-rules')
+def format_rule_stats():
+    return jsonify({"rules": format_engine.stats()})
+
 @app.route('/')
 def health_check():
     return jsonify({"status": "AI Service Running!"})
 
+@app.route('/ready')
+def readiness_check():
+    """200 once every model is loaded in this worker, 503 before (liveness is '/')."""
+    status = models_status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+@app.route('/warmup', methods=['POST'])
+def warmup():
+    """Loads the models now (retrying any that failed) instead of on the first analysis."""
+    warm_up(retry=True)
+    status = models_status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+def models_status():
+    return {
+        "ready": all(model.loaded for model in MODELS.values()),
+        "models": {name: model.status() for name, model in MODELS.items()}
+    }
+
+def warm_up(retry=False):
+    """Loads every model and runs a tiny parse and encode through them, so the first request is not slow."""
+    for model in MODELS.values():
+        model.load(retry=retry)
+    try:
+        if nlp.get():
+            extract_keywords_from_texts(["python developer"], nlp.get())
+        if sentence_model.get():
+            sentence_model.get().encode(["python developer"], convert_to_tensor=False)
+    except Exception as e:
+        logging.error(f"Model warmup failed: {e}")
+
+@app.route('/cache-stats')
+def cache_stats():
+    return jsonify({
+        "embedding_cache": embedding_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "resume_cache": resume_cache.stats()
+    })
+
 @app.route('/analyze-resume-jd', methods=['POST'])
+@admission_controlled
 def analyze_resume_jd():
+    try:
+        resume_file, file_extension, job_description_text, job_description = read_analysis_request()
+    except AnalysisRequestError as e:
+        return jsonify({"error": e.message}), e.status
+
+    # Per-stage timings (ms) in debug_info are opt-in: includeTimings=1
+    timings = {} if timings_requested() else None
+    try:
+        complete_response = run_analysis(
+            resume_file.read(),
+            file_extension,
+            job_description_text,
+            job_description,
+            resume_id=request.form.get('resumeId'),
+            filename=resume_file.filename,
+            previous_analysis_id=request.form.get('previousAnalysisId'),
+            timings=timings
+        )
+        if timings is not None:
+            complete_response["debug_info"]["timings"] = timings
+        return jsonify(complete_response)
+
+    except AnalysisRequestError as e:
+        return jsonify({"error": e.message}), e.status
+    except Exception as e:
+        app.logger.error(f"Error processing resume and job description: {e}", exc_info=True)
+        return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
+
+@app.route('/jobs', methods=['POST'])
+def submit_analysis_job():
+    try:
+        resume_file, file_extension, job_description_text, job_description = read_analysis_request()
+    except AnalysisRequestError as e:
+        return jsonify({"error": e.message}), e.status
+
+    try:
+        job = job_manager.submit(
+            run_analysis,
+            resume_file.read(),
+            file_extension,
+            job_description_text,
+            job_description,
+            resume_id=request.form.get('resumeId'),
+            filename=resume_file.filename,
+            previous_analysis_id=request.form.get('previousAnalysisId')
+        )
+    except ServiceOverloaded:
+        response = jsonify({"error": "Analysis queue is full. Please retry shortly."})
+        response.status_code = 503
+        response.headers['Retry-After'] = ANALYSIS_RETRY_AFTER
+        return response
+
+    return jsonify({
+        "jobId": job["id"],
+        "status": job["status"],
+        "queue_depth": job["queue_depth"],
+        "statusUrl": f"/jobs/{job['id']}",
+        "resultUrl": f"/jobs/{job['id']}/result"
+    }), 202
+
+@app.route('/jobs', methods=['GET'])
+def analysis_job_stats():
+    return jsonify(job_manager.stats())
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job ID"}), 404
+
+    return jsonify({
+        "jobId": job["id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "queue_depth": job["queue_depth"],
+        "timings": job["timings"],
+        "error": job["error"]
+    })
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_analysis_job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job ID"}), 404
+
+    if job["status"] == "done":
+        return jsonify(job["result"])
+    if job["status"] == "failed":
+        return jsonify({"error": job["error"]}), job["error_status"] or 500
+
+    # Still queued or running
+    return jsonify({"jobId": job["id"], "status": job["status"]}), 202
+
+def timings_requested():
+    """True if the request opted into the per-stage timing breakdown."""
+    return request.values.get('includeTimings', '').lower() in ('1', 'true', 'yes')
+
+class AnalysisRequestError(Exception):
+    """An analysis request problem that maps to an error response."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+def read_analysis_request():
+    """
+    Validates the resume upload and job description of an analysis request.
+    Returns (resume_file, file_extension, job_description_text, job_description),
+    where job_description is the registered JD record when jobDescriptionId was sent.
+    """
     if 'resume' not in request.files:
-        return jsonify({"error": "No resume file provided"}), 400
-    if 'jobDescription' not in request.form:
-        return jsonify({"error": "No job description provided"}), 400
+        raise AnalysisRequestError("No resume file provided")
+    if 'jobDescription' not in request.form and 'jobDescriptionId' not in request.form:
+        raise AnalysisRequestError("No job description provided")
 
     resume_file = request.files['resume']
-    job_description_text = request.form['jobDescription']
+
+    # A pre-registered JD brings its precomputed keywords and embeddings
+    job_description = None
+    if 'jobDescriptionId' in request.form:
+        job_description = job_description_store.get(request.form['jobDescriptionId'])
+        if job_description is None:
+            raise AnalysisRequestError("Unknown job description ID", 404)
+        job_description_text = job_description["text"]
+    else:
+        job_description_text = request.form['jobDescription']
 
+    if resume_file.filename == '':
+        raise AnalysisRequestError("No selected file")
+
+    file_extension = os.path.splitext(resume_file.filename)[1].lower()
+
+    if file_extension not in ['.pdf', '.docx']:
+        raise AnalysisRequestError("Unsupported file type. Please upload PDF or DOCX.")
+
+    return resume_file, file_extension, job_description_text, job_description
+
+def run_analysis(resume_bytes, file_extension, job_description_text, job_description=None,
+                 resume_id=None, filename=None, previous_analysis_id=None, timings=None):
+    """
+    Full resume/JD analysis used by the synchronous route and the async job API.
+    previous_analysis_id is the analysisId of an earlier revision of the resume,
+    whose unchanged parts are reused. Stage durations (ms) are written to `timings`
+    when a dict is given.
+    """
+    # Serve repeated resume/JD pairs from the result cache
+    cache_key = result_cache_key(resume_bytes, job_description_text)
+    cached_response = result_cache.get(cache_key)
+    if cached_response is not None:
+        if RESUME_INDEX_ENABLED and resume_id:
+            # Still indexed under this caller's ID; the artifacts are usually in the resume cache
+            resume_artifacts = get_resume_artifacts(resume_bytes, file_extension, timings)
+            if resume_artifacts:
+                add_to_resume_index(resume_artifacts, resume_id, filename)
+        return with_cache_flag(cached_response, True)
+
+    # 1. Extract text and resume-only artifacts (cached per resume file)
+    resume_artifacts = get_resume_artifacts(resume_bytes, file_extension, timings, previous_analysis_id)
+
+    if not resume_artifacts:
+        raise AnalysisRequestError("Failed to extract text from resume.", 500)
+
+    add_to_resume_index(resume_artifacts, resume_id, filename)
+
+    # 2-8. Run the analysis pipeline
+    complete_response = build_analysis_response(resume_artifacts, job_description_text, job_description, timings)
+    if models_ready():
+        result_cache.set(cache_key, complete_response)
+
+    return with_cache_flag(complete_response, False)
+
+@contextmanager
+def stage_timer(timings, stage):
+    """
+    Records how long a pipeline stage took in the stage latency histogram,
+    and in `timings` (ms) if a dict is given.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_duration.observe(elapsed, stage=stage)
+        if timings is not None:
+            timings[stage] = round(elapsed * 1000, 2)
+
+def build_analysis_response(resume_artifacts, job_description_text, job_description=None, timings=None):
+    """
+    Runs matching against the JD and builds the full response from the resume artifacts.
+    job_description is an optional registered JD record with precomputed keywords/embeddings.
+    """
+    extracted_resume_text = resume_artifacts["text"]
+
+    # 2. Perform job matching analysis
+    text_length.observe(len(extracted_resume_text), source="resume")
+    text_length.observe(len(job_description_text), source="job_description")
+    with stage_timer(timings, "job_matching"):
+        job_matching_results = perform_job_matching(
+            extracted_resume_text,
+            job_description_text,
+            resume_keywords=resume_artifacts["keywords"],
+            resume_embeddings=resume_artifacts["embeddings"],
+            jd_keywords=job_description["keywords"] if job_description else None,
+            jd_embeddings=job_description["embeddings"] if job_description else None,
+            timings=timings
+        )
+    
+    # 3. Format analysis (computed with the resume artifacts)
+    format_analysis = resume_artifacts["format_analysis"]
+    format_suggestions = generate_format_suggestions(format_analysis["format_issues"])
+    
+    # 4. Structured data (computed with the resume artifacts)
+    resume_structured_data = resume_artifacts["structured_data"]
+    
+    # 5. Generate missing keywords analysis
+    missing_keywords = find_missing_keywords(
+        job_matching_results.get("jd_keywords_extracted", []),
+        job_matching_results.get("resume_keywords_extracted", [])
+    )
+    
+    # 6. Combine format and content scoring
+    content_score = job_matching_results.get("matchScore", 0)
+    format_score = format_analysis.get("format_score", 0)
+    
+    # Weighted overall score (70% content matching, 30% format)
+    overall_score = (content_score * 0.7) + (format_score * 0.3)
+    
+    # 7. Generate comprehensive feedback
+    feedback = generate_comprehensive_feedback(
+        overall_score,
+        job_matching_results.get("matched_details", []),
+        format_analysis["format_issues"],
+        missing_keywords
+    )
+
+    # 8. Build complete response matching your Node.js structure
+    complete_response = {
+        "structured": {
+            "keywords": convert_matched_details_to_keywords(job_matching_results.get("matched_details", [])),
+            "missingKeywords": missing_keywords,
+            "formatIssues": format_analysis["format_issues"],
+            "suggestions": format_suggestions + generate_content_suggestions(missing_keywords)
+        },
+        "matchScore": round(overall_score, 2),
+        "analysisId": resume_artifacts.get("analysis_id"),
+        "feedback": feedback,
+        "resumeData": resume_structured_data,
+        "analysis_details": {
+            "content_match_score": content_score,
+            "format_score": format_score,
+            "total_format_issues": format_analysis["total_issues"],
+            "resume_keywords_count": len(job_matching_results.get("resume_keywords_extracted", [])),
+            "jd_keywords_count": len(job_matching_results.get("jd_keywords_extracted", [])),
+            "matched_keywords_count": len(job_matching_results.get("matched_details", []))
+        },
+        "debug_info": {
+            "extracted_resume_text_length": len(extracted_resume_text),
+            "job_description_text_length": len(job_description_text),
+            "resume_keywords_extracted": job_matching_results.get("resume_keywords_extracted", [])[:10],  # First 10 for debugging
+            "jd_keywords_extracted": job_matching_results.get("jd_keywords_extracted", [])[:10],
+            "text_extraction": resume_artifacts.get("extraction"),
+            "reanalysis": resume_artifacts.get("reanalysis")
+        }
+    }
+
+    return complete_response
+
+def get_resume_artifacts(resume_bytes, file_extension, timings=None, previous_analysis_id=None):
+    """
+    Returns everything that depends only on the resume (text, keywords, their
+    embeddings, format analysis and structured data), reusing the artifact cache
+    when the same file was analyzed before. Returns None if no text was extracted.
+    previous_analysis_id names an earlier analysis of a revision of this resume
+    whose unchanged spans are reused (see build_resume_artifacts).
+    """
+    cache_key = hash_bytes(ANALYSIS_VERSION, resume_bytes)
+    resume_artifacts = resume_cache.get(cache_key)
+    if resume_artifacts is not None:
+        return resume_artifacts
+
+    with stage_timer(timings, "text_extraction"):
+        extracted_resume_text, extraction_info = extract_document(resume_bytes, file_extension)
+    if not extracted_resume_text:
+        return None
+
+    previous_artifacts = None
+    if INCREMENTAL_REANALYSIS and previous_analysis_id and re.fullmatch(r'[0-9a-f]{64}', previous_analysis_id):
+        previous_artifacts = resume_cache.get(previous_analysis_id)
+    resume_artifacts = build_resume_artifacts(extracted_resume_text, timings, previous_artifacts)
+    if previous_analysis_id and resume_artifacts["reanalysis"]:
+        resume_artifacts["reanalysis"]["previous_analysis_id"] = previous_analysis_id
+    resume_artifacts["analysis_id"] = cache_key
+    resume_artifacts["content_hash"] = hash_bytes(resume_bytes)
+    resume_artifacts["extraction"] = extraction_info
+    if models_ready():
+        resume_cache.set(cache_key, resume_artifacts)
+    return resume_artifacts
+
+def build_resume_artifacts(extracted_resume_text, timings=None, previous_artifacts=None):
+    """
+    Runs the JD-independent part of the pipeline on extracted resume text. With the
+    artifacts of an earlier revision, spans whose text is unchanged keep their keywords
+    without being parsed again, and keywords seen before keep their embeddings; the
+    format check and structured data are recomputed over the whole new text.
+    """
+    previous_span_keywords = previous_artifacts.get("span_keywords") if previous_artifacts else None
+    (resume_keywords,), (span_keywords,), parsed_spans = extract_resume_keywords(
+        [extracted_resume_text], previous_span_keywords, timings
+    )
+
+    known_embeddings = {}
+    if previous_artifacts and previous_artifacts.get("embeddings") is not None:
+        known_embeddings = dict(zip(previous_artifacts["keywords"], previous_artifacts["embeddings"]))
+    new_keywords = [keyword for keyword in resume_keywords if keyword not in known_embeddings]
+    resume_embeddings = None
+    if resume_keywords and sentence_model.get():
+        if new_keywords:
+            with stage_timer(timings, "resume_embeddings"):
+                encoded = normalize_embeddings(embedding_cache.encode(new_keywords, keyword_encoder()))
+            known_embeddings.update(zip(new_keywords, encoded))
+        resume_embeddings = np.stack([known_embeddings[keyword] for keyword in resume_keywords])
+
+    resume_artifacts = finish_resume_artifacts(extracted_resume_text, resume_keywords, resume_embeddings,
+                                               span_keywords, timings)
+    resume_artifacts["reanalysis"] = None
+    if span_keywords is not None:
+        resume_artifacts["reanalysis"] = {
+            "previous_analysis_id": None,
+            "previous_found": previous_artifacts is not None,
+            "spans": len(span_keywords),
+            "parsed_spans": parsed_spans,
+            "encoded_keywords": len(new_keywords),
+        }
+    return resume_artifacts
+
+def resume_spans(text):
+    """
+    Splits resume text into the spans keywords are extracted from: paragraphs (blocks
+    between blank lines), with paragraphs of more than RESUME_SPAN_MAX_LINES lines
+    split into single lines (e.g. DOCX text, which has one paragraph per line).
+    """
+    spans = []
+    for block in re.split(r'\n\s*\n', text):
+        lines = [line for line in block.split('\n') if line.strip()]
+        if len(lines) > RESUME_SPAN_MAX_LINES:
+            spans.extend(lines)
+        elif lines:
+            spans.append('\n'.join(lines))
+    return spans
+
+def extract_resume_keywords(texts, known_span_keywords=None, timings=None):
+    """
+    Resume keywords of each text. By default each whole text is parsed, in one
+    nlp.pipe call, and no span keywords are returned (None). With INCREMENTAL_REANALYSIS
+    they are extracted span by span (resume_spans) with one nlp.pipe call over the
+    distinct spans of all texts, and spans found in known_span_keywords (span hash ->
+    keywords, from an earlier analysis) are not parsed again.
+    Returns (keyword lists, span keyword dicts, number of texts or spans parsed).
+    """
+    nlp_model = nlp.get()
+    if not INCREMENTAL_REANALYSIS:
+        with stage_timer(timings, "resume_keywords"):
+            keyword_lists = extract_keywords_from_texts(texts, nlp_model)
+        parsed = sum(1 for text in texts if text) if nlp_model else 0
+        return keyword_lists, [None] * len(texts), parsed
+    if not nlp_model:
+        return [[] for _ in texts], [{} for _ in texts], 0
+
+    span_lists = [[(hash_bytes(span), span) for span in resume_spans(text)] for text in texts]
+    span_keywords = dict(known_span_keywords or {})
+    to_parse = {}
+    for spans in span_lists:
+        for span_hash, span in spans:
+            if span_hash not in span_keywords:
+                to_parse.setdefault(span_hash, span)
+    with stage_timer(timings, "resume_keywords"):
+        parsed = extract_keywords_from_texts(list(to_parse.values()), nlp_model, as_spans=True)
+        span_keywords.update(zip(to_parse, parsed))
+
+    keyword_lists = []
+    span_keyword_dicts = []
+    for spans in span_lists:
+        text_span_keywords = {span_hash: span_keywords[span_hash] for span_hash, _ in spans}
+        span_keyword_dicts.append(text_span_keywords)
+        if KEYWORD_CANONICALIZATION != 'off':
+            # Ranked, capped and counted over the whole resume, not span by span
+            keyword_lists.append(merge_span_keywords(text_span_keywords.values()))
+            continue
+        keyword_lists.append(list(dict.fromkeys(
+            keyword for keywords in text_span_keywords.values() for keyword in keywords
+        )))
+    return keyword_lists, span_keyword_dicts, len(to_parse)
+
+def finish_resume_artifacts(extracted_resume_text, resume_keywords, resume_embeddings, span_keywords=None,
+                            timings=None):
+    """Adds the format analysis and structured data to a resume's keywords and embeddings."""
+    # Lines, words and the lowercased text are split once for both stages
+    parsed_resume = ParsedResume(extracted_resume_text)
+    with stage_timer(timings, "format_check"):
+        format_analysis = check_resume_format(extracted_resume_text, parsed_resume)
+    with stage_timer(timings, "structured_data"):
+        structured_data = extract_resume_structured_data(extracted_resume_text, parsed_resume)
+
+    return {
+        "text": extracted_resume_text,
+        "keywords": resume_keywords,
+        "embeddings": resume_embeddings,
+        "span_keywords": span_keywords,
+        "format_analysis": format_analysis,
+        "structured_data": structured_data
+    }
+
+def result_cache_key(resume_bytes, job_description_text):
+    """Cache key over the resume bytes, the normalized JD text and the model versions."""
+    return hash_bytes(ANALYSIS_VERSION, resume_bytes, normalize_phrase(job_description_text))
+
+def with_cache_flag(complete_response, cache_hit):
+    """Returns a copy of a response whose debug_info says whether it came from the result cache."""
+    response = dict(complete_response)
+    response["debug_info"] = dict(complete_response.get("debug_info", {}), cache_hit=cache_hit)
+    return response
+
+@app.route('/job-descriptions', methods=['POST'])
+@admission_controlled
+def register_job_description():
+    payload = request.get_json(silent=True) or request.form
+    job_description_text = payload.get('jobDescription', '')
+    if not str(job_description_text).strip():
+        return jsonify({"error": "No job description provided"}), 400
+
+    # A JD embedded without the models would be stored without keywords or embeddings
+    if not models_ready():
+        return jsonify({"error": "AI models not loaded. Cannot register the job description."}), 503
+
+    try:
+        job_description = build_job_description_record(str(job_description_text))
+        if not job_description["keywords"]:
+            return jsonify({"error": "Could not extract keywords from Job Description. Please provide a more detailed JD."}), 400
+
+        job_description_store.set(job_description["id"], job_description)
+        return jsonify({
+            "jobDescriptionId": job_description["id"],
+            "jd_keywords_count": len(job_description["keywords"]),
+            "jd_keywords_extracted": job_description["keywords"][:10]
+        }), 201
+
+    except Exception as e:
+        app.logger.error(f"Error registering job description: {e}", exc_info=True)
+        return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
+
+@app.route('/job-descriptions/<job_description_id>', methods=['GET'])
+def get_job_description(job_description_id):
+    job_description = job_description_store.get(job_description_id)
+    if job_description is None:
+        return jsonify({"error": "Unknown job description ID"}), 404
+
+    return jsonify({
+        "jobDescriptionId": job_description["id"],
+        "jobDescription": job_description["text"],
+        "jd_keywords_extracted": job_description["keywords"],
+        "created_at": job_description["created_at"]
+    })
+
+def build_job_description_record(job_description_text):
+    """
+    Extracts and embeds the keywords of a JD once so it can be matched against
+    many resumes. The ID is derived from the normalized text and model versions,
+    so registering the same JD twice returns the same ID.
+    """
+    jd_keywords = extract_keywords_from_text(job_description_text, nlp.get())
+    jd_embeddings = None
+    if jd_keywords and sentence_model.get():
+        jd_embeddings = normalize_embeddings(embedding_cache.encode(jd_keywords, keyword_encoder()))
+
+    return {
+        "id": "jd_" + hash_bytes(ANALYSIS_VERSION, normalize_phrase(job_description_text))[:24],
+        "text": job_description_text,
+        "keywords": jd_keywords,
+        "embeddings": jd_embeddings,
+        "created_at": time.time()
+    }
+
+@app.route('/resume-index/resumes', methods=['POST'])
+@admission_controlled
+def index_resume():
+    if 'resume' not in request.files:
+        return jsonify({"error": "No resume file provided"}), 400
+
+    resume_file = request.files['resume']
     if resume_file.filename == '':
         return jsonify({"error": "No selected file"}), 400
 
@@ -437,132 +1329,579 @@ def analyze_resume_jd():
         return jsonify({"error": "Unsupported file type. Please upload PDF or DOCX."}), 400
 
     try:
-        # 1. Extract text from resume
-        file_stream = io.BytesIO(resume_file.read())
-        extracted_resume_text = extract_text_from_doc(file_stream, file_extension)
-        
-        if not extracted_resume_text:
+        resume_artifacts = get_resume_artifacts(resume_file.read(), file_extension)
+
+        if not resume_artifacts:
             return jsonify({"error": "Failed to extract text from resume."}), 500
+        if resume_artifacts["embeddings"] is None:
+            return jsonify({"error": "Could not extract keywords from Resume. Please ensure resume is parsable."}), 400
+
+        resume_id = add_to_resume_index(resume_artifacts, request.form.get('resumeId'), resume_file.filename, force=True)
+        return jsonify({"resumeId": resume_id, "corpus_size": len(resume_index)}), 201
+
+    except Exception as e:
+        app.logger.error(f"Error indexing resume: {e}", exc_info=True)
+        return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
+
+@app.route('/resume-index/resumes/<resume_id>', methods=['DELETE'])
+def delete_indexed_resume(resume_id):
+    try:
+        if not resume_index.delete(resume_id):
+            return jsonify({"error": "Resume is not indexed"}), 404
+        return jsonify({"resumeId": resume_id, "corpus_size": len(resume_index)})
+
+    except Exception as e:
+        app.logger.error(f"Error removing resume from index: {e}", exc_info=True)
+        return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
 
-        # 2. Perform job matching analysis
-        job_matching_results = perform_job_matching(extracted_resume_text, job_description_text)
-        
-        # 3. Perform format analysis
-        format_analysis = check_resume_format(extracted_resume_text)
-        format_suggestions = generate_format_suggestions(format_analysis["format_issues"])
-        
-        # 4. Extract structured data from resume
-        resume_structured_data = extract_resume_structured_data(extracted_resume_text)
-        
-        # 5. Generate missing keywords analysis
-        missing_keywords = find_missing_keywords(
-            job_matching_results.get("jd_keywords_extracted", []),
-            job_matching_results.get("resume_keywords_extracted", [])
+@app.route('/resume-index/search', methods=['POST'])
+@admission_controlled
+def search_resume_index():
+    payload = request.get_json(silent=True) or request.form
+
+    if payload.get('jobDescriptionId'):
+        job_description = job_description_store.get(payload['jobDescriptionId'])
+        if job_description is None:
+            return jsonify({"error": "Unknown job description ID"}), 404
+    elif str(payload.get('jobDescription', '')).strip():
+        job_description = build_job_description_record(str(payload['jobDescription']))
+    else:
+        return jsonify({"error": "No job description provided"}), 400
+
+    if not job_description["keywords"] or job_description["embeddings"] is None:
+        return jsonify({"error": "Could not extract keywords from Job Description. Please provide a more detailed JD."}), 400
+
+    try:
+        top_k = max(1, min(int(payload.get('topK', 10)), 1000))
+    except (TypeError, ValueError):
+        return jsonify({"error": "topK must be an integer"}), 400
+
+    try:
+        start = time.perf_counter()
+        results = search_resumes(job_description, top_k)
+        return jsonify({
+            "results": results,
+            "corpus_size": len(resume_index),
+            "took_ms": round((time.perf_counter() - start) * 1000, 2)
+        })
+
+    except Exception as e:
+        app.logger.error(f"Error searching resume index: {e}", exc_info=True)
+        return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
+
+def add_to_resume_index(resume_artifacts, resume_id=None, filename=None, force=False):
+    """
+    Stores an analyzed resume's keyword embeddings in the resume index under
+    resume_id, replacing an earlier entry of that ID. Analyses are indexed only
+    with RESUME_INDEX_ENABLED and a stable resume ID from the caller, so uploads
+    without one are never stored; `force` (the indexing endpoint) indexes anyway,
+    under a hash of the file if no ID is given.
+    Indexing problems are logged and never fail the analysis itself.
+    Returns the resume ID used in the index.
+    """
+    if not (force or (RESUME_INDEX_ENABLED and resume_id)) or resume_artifacts["embeddings"] is None:
+        return resume_id
+    resume_id = resume_id or f"resume_{resume_artifacts['content_hash'][:24]}"
+    try:
+        resume_index.add(
+            resume_id,
+            resume_artifacts["keywords"],
+            resume_artifacts["embeddings"],
+            metadata={"filename": filename, "content_hash": resume_artifacts["content_hash"]}
         )
-        
-        # 6. Combine format and content scoring
-        content_score = job_matching_results.get("matchScore", 0)
+    except Exception as e:
+        logging.error(f"Error adding resume to index: {e}")
+        if force:
+            raise
+    return resume_id
+
+def search_resumes(job_description, top_k, candidate_multiplier=10):
+    """
+    Finds the best resumes in the index for a JD record. Pooled document vectors
+    shortlist candidates with one matrix-vector product over the whole corpus; the
+    shortlist is then re-ranked with the same keyword-level scoring as /analyze-resume-jd.
+
+    The search is approximate: only the RESUME_SEARCH_SHORTLIST (or top_k * candidate_multiplier,
+    if larger) resumes closest to the JD's pooled vector are re-ranked, so a resume
+    outside that shortlist is missed even if its keyword-level matchScore would rank
+    it in the top_k. It is exact while the corpus is no larger than the shortlist.
+    """
+    jd_keywords = job_description["keywords"]
+    jd_embeddings = job_description["embeddings"]
+
+    query_vector = jd_embeddings.mean(axis=0)
+    query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+
+    results = []
+    with resume_index.reading():
+        shortlist = resume_index.candidates(query_vector, max(top_k * candidate_multiplier, RESUME_SEARCH_SHORTLIST))
+        for entry, pooled_score in shortlist:
+            best_jd_indices, best_match_scores = find_best_matches(resume_index.keyword_embeddings(entry), jd_embeddings, jd_keywords)
+            match = aggregate_best_matches(entry["keywords"], jd_keywords, best_jd_indices, best_match_scores)
+            results.append({
+                "resumeId": entry["id"],
+                "matchScore": match["matchScore"],
+                "pooled_similarity": round(pooled_score, 4),
+                "matched_details": match["matched_details"],
+                "metadata": entry["metadata"]
+            })
+
+    results.sort(key=lambda result: (result["matchScore"], result["pooled_similarity"]), reverse=True)
+    return results[:top_k]
+
+@app.route('/analyze-resume-jd-batch', methods=['POST'])
+@admission_controlled
+def analyze_resume_jd_batch():
+    if 'resume' not in request.files:
+        return jsonify({"error": "No resume file provided"}), 400
+
+    job_description_texts = parse_job_descriptions_field(request.form)
+    if not any(text.strip() for text in job_description_texts):
+        return jsonify({"error": "No job descriptions provided"}), 400
+
+    resume_file = request.files['resume']
+    if resume_file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+
+    file_extension = os.path.splitext(resume_file.filename)[1].lower()
+
+    if file_extension not in ['.pdf', '.docx']:
+        return jsonify({"error": "Unsupported file type. Please upload PDF or DOCX."}), 400
+
+    timings = {} if timings_requested() else None
+    try:
+        # 1. Extract text and run the resume-only analyses once
+        resume_artifacts = get_resume_artifacts(resume_file.read(), file_extension, timings)
+
+        if not resume_artifacts:
+            return jsonify({"error": "Failed to extract text from resume."}), 500
+
+        format_analysis = resume_artifacts["format_analysis"]
         format_score = format_analysis.get("format_score", 0)
-        
-        # Weighted overall score (70% content matching, 30% format)
-        overall_score = (content_score * 0.7) + (format_score * 0.3)
-        
-        # 7. Generate comprehensive feedback
-        feedback = generate_comprehensive_feedback(
-            overall_score,
-            job_matching_results.get("matched_details", []),
-            format_analysis["format_issues"],
-            missing_keywords
+
+        stream_format = requested_stream_format()
+        if stream_format:
+            return streaming_response(
+                stream_batch_analysis(resume_artifacts, job_description_texts, timings), stream_format
+            )
+
+        # 2. Score the resume against every non-blank job description in one model pass
+        indices = [index for index, text in enumerate(job_description_texts) if text.strip()]
+        batch_results = perform_batch_job_matching(
+            resume_artifacts["text"],
+            [job_description_texts[index] for index in indices],
+            resume_keywords=resume_artifacts["keywords"],
+            resume_embeddings=resume_artifacts["embeddings"],
+            timings=timings
         )
 
-        # 8. Build complete response matching your Node.js structure
-        complete_response = {
-            "structured": {
-                "keywords": convert_matched_details_to_keywords(job_matching_results.get("matched_details", [])),
-                "missingKeywords": missing_keywords,
-                "formatIssues": format_analysis["format_issues"],
-                "suggestions": format_suggestions + generate_content_suggestions(missing_keywords)
-            },
-            "matchScore": round(overall_score, 2),
-            "feedback": feedback,
-            "resumeData": resume_structured_data,
+        results = [{"index": index, "error": EMPTY_JD_ERROR} for index in range(len(job_description_texts))]
+        for index, job_matching_results in zip(indices, batch_results):
+            results[index] = batch_result_item(index, job_matching_results, format_score)
+
+        batch_response = {
+            "results": results,
+            "formatScore": format_score,
+            "formatIssues": format_analysis["format_issues"],
             "analysis_details": {
-                "content_match_score": content_score,
-                "format_score": format_score,
-                "total_format_issues": format_analysis["total_issues"],
-                "resume_keywords_count": len(job_matching_results.get("resume_keywords_extracted", [])),
-                "jd_keywords_count": len(job_matching_results.get("jd_keywords_extracted", [])),
-                "matched_keywords_count": len(job_matching_results.get("matched_details", []))
-            },
-            "debug_info": {
-                "extracted_resume_text_length": len(extracted_resume_text),
-                "job_description_text_length": len(job_description_text),
-                "resume_keywords_extracted": job_matching_results.get("resume_keywords_extracted", [])[:10],  # First 10 for debugging
-                "jd_keywords_extracted": job_matching_results.get("jd_keywords_extracted", [])[:10]
+                "job_descriptions_count": len(job_description_texts),
+                "resume_keywords_count": len(resume_artifacts["keywords"])
             }
         }
+        if timings is not None:
+            batch_response["debug_info"] = {"timings": timings}
+        return jsonify(batch_response)
 
-        return jsonify(complete_response)
+    except Exception as e:
+        app.logger.error(f"Error processing batch analysis: {e}", exc_info=True)
+        return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
+
+def batch_result_item(index, job_matching_results, format_score):
+    """One job description's entry in a batch response."""
+    missing_keywords = find_missing_keywords(
+        job_matching_results.get("jd_keywords_extracted", []),
+        job_matching_results.get("resume_keywords_extracted", [])
+    )
+    content_score = job_matching_results.get("matchScore", 0)
+    overall_score = (content_score * 0.7) + (format_score * 0.3)
 
+    return {
+        "index": index,
+        "matchScore": round(overall_score, 2),
+        "keywords": convert_matched_details_to_keywords(job_matching_results.get("matched_details", [])),
+        "missingKeywords": missing_keywords,
+        "content_match_score": content_score,
+        "jd_keywords_count": len(job_matching_results.get("jd_keywords_extracted", [])),
+        "matched_keywords_count": len(job_matching_results.get("matched_details", [])),
+        "message": job_matching_results.get("message", "")
+    }
+
+def stream_batch_analysis(resume_artifacts, job_description_texts, timings=None):
+    """
+    Streamed /analyze-resume-jd-batch: a record with the resume's format analysis,
+    then one record per job description, then a summary. Job descriptions are
+    matched BULK_BATCH_SIZE at a time, so results are sent while later ones are
+    still being scored.
+    """
+    start = time.perf_counter()
+    format_analysis = resume_artifacts["format_analysis"]
+    format_score = format_analysis.get("format_score", 0)
+    yield {
+        "status": "resume",
+        "formatScore": format_score,
+        "formatIssues": format_analysis["format_issues"],
+        "resume_keywords_count": len(resume_artifacts["keywords"])
+    }
+
+    failed = 0
+    for chunk_start in range(0, len(job_description_texts), BULK_BATCH_SIZE):
+        chunk = range(chunk_start, min(chunk_start + BULK_BATCH_SIZE, len(job_description_texts)))
+        records = {index: {"index": index, "status": "error", "error": EMPTY_JD_ERROR} for index in chunk}
+        indices = [index for index in chunk if job_description_texts[index].strip()]
+        try:
+            batch_results = perform_batch_job_matching(
+                resume_artifacts["text"],
+                [job_description_texts[index] for index in indices],
+                resume_keywords=resume_artifacts["keywords"],
+                resume_embeddings=resume_artifacts["embeddings"]
+            ) if indices else []
+        except Exception as e:
+            app.logger.error(f"Error processing batch analysis: {e}", exc_info=True)
+            for index in indices:
+                records[index]["error"] = f"An error occurred during processing: {str(e)}"
+        else:
+            for index, job_matching_results in zip(indices, batch_results):
+                records[index] = {"index": index, "status": "ok",
+                                  "result": batch_result_item(index, job_matching_results, format_score)}
+        for index in chunk:
+            failed += records[index]["status"] == "error"
+            yield records[index]
+
+    summary = {
+        "status": "summary",
+        "total": len(job_description_texts),
+        "succeeded": len(job_description_texts) - failed,
+        "failed": failed,
+        "took_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+    if timings is not None:
+        summary["timings"] = timings
+    yield summary
+
+def parse_job_descriptions_field(form):
+    """
+    Reads job descriptions from a form, either as repeated 'jobDescriptions'
+    fields or as a single JSON array of strings. A single value that is not a JSON
+    array of strings is one plain-text job description. Blank entries keep their
+    position, so result indices match the request order (see EMPTY_JD_ERROR).
+    """
+    values = form.getlist('jobDescriptions')
+    if len(values) == 1 and values[0].lstrip().startswith('['):
+        try:
+            parsed = json.loads(values[0])
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, list) and all(isinstance(value, str) for value in parsed):
+            values = parsed
+    return list(values)
+
+EMPTY_JD_ERROR = "Empty job description"
+
+@app.route('/analyze-resume-jd-bulk', methods=['POST'])
+@admission_controlled
+def analyze_resume_jd_bulk():
+    """
+    Analyzes many resumes against one job description. Resumes are sent as repeated
+    'resumes' files; ZIP archives among them are expanded. Results stream back as
+    NDJSON (or Server-Sent Events with stream=sse), one record per file in
+    completion order, then a summary record.
+    """
+    if 'jobDescription' not in request.form and 'jobDescriptionId' not in request.form:
+        return jsonify({"error": "No job description provided"}), 400
+
+    uploads = [upload for upload in request.files.getlist('resumes') if upload.filename]
+    if not uploads:
+        return jsonify({"error": "No resume files provided"}), 400
+
+    if 'jobDescriptionId' in request.form:
+        job_description = job_description_store.get(request.form['jobDescriptionId'])
+        if job_description is None:
+            return jsonify({"error": "Unknown job description ID"}), 404
+    else:
+        job_description = None
+
+    entries = read_bulk_uploads(uploads, request.form.getlist('resumeIds'))
+    if len(entries) > BULK_MAX_FILES:
+        return jsonify({"error": f"Too many resumes (limit {BULK_MAX_FILES})"}), 400
+
+    try:
+        # The JD is parsed and embedded once for all resumes
+        job_description = job_description or build_job_description_record(request.form['jobDescription'])
     except Exception as e:
-        app.logger.error(f"Error processing resume and job description: {e}", exc_info=True)
+        app.logger.error(f"Error processing bulk job description: {e}", exc_info=True)
         return jsonify({"error": f"An error occurred during processing: {str(e)}"}), 500
 
+    # The request context (and the uploads the entries read from) stays open while the response streams
+    return streaming_response(
+        stream_with_context(stream_bulk_analysis(entries, job_description)), requested_stream_format("ndjson")
+    )
+
+def read_bulk_uploads(uploads, resume_ids=()):
+    """
+    Lists the uploaded files of a bulk request as entries with index, upload (position
+    of the uploaded file it came from), filename, file_extension, resume_id and read (a
+    callable returning the file's bytes), or an error for files that cannot be analyzed.
+    resume_ids are the callers' IDs of the uploads, in order (used for the resume index).
+    ZIP archives contribute one entry per file inside them; if the archive has an ID,
+    each member's ID is derived from it and the member's position in the archive, in the
+    same 24-hex-digit format. Nothing is read or decompressed here: stream_bulk_analysis
+    reads each file when it is submitted for extraction, so only the files in flight are in memory.
+    """
+    entries = []
+
+    def add(upload_index, filename, read=None, error=None, resume_id=None):
+        file_extension = os.path.splitext(filename)[1].lower()
+        if error is None and file_extension not in ['.pdf', '.docx']:
+            error = "Unsupported file type. Please upload PDF or DOCX."
+        entries.append({"index": len(entries), "upload": upload_index, "filename": filename,
+                        "file_extension": file_extension, "resume_id": resume_id,
+                        "read": None if error else read, "error": error})
+
+    for i, upload in enumerate(uploads):
+        resume_id = resume_ids[i] if i < len(resume_ids) else None
+        if not upload.filename.lower().endswith('.zip'):
+            add(i, upload.filename, upload.read, resume_id=resume_id)
+            continue
+        try:
+            # Left open for the lazy reads; the upload is closed when the request ends
+            archive = zipfile.ZipFile(upload.stream)
+            for position, info in enumerate(archive.infolist()):
+                name = info.filename
+                if info.is_dir() or name.startswith('__MACOSX/') or os.path.basename(name).startswith('.'):
+                    continue
+                member_id = hash_bytes(resume_id, str(position))[:24] if resume_id else None
+                if len(entries) >= BULK_MAX_FILES:
+                    # Counted against the limit without reading the rest of the archive
+                    add(i, name, error="Too many files", resume_id=member_id)
+                elif info.file_size > app.config['MAX_CONTENT_LENGTH']:
+                    add(i, name, error="File is too large", resume_id=member_id)
+                else:
+                    add(i, name, functools.partial(archive.read, info), resume_id=member_id)
+        except (zipfile.BadZipFile, zipfile.LargeZipFile, NotImplementedError, RuntimeError) as e:
+            add(i, upload.filename, error=f"Could not read ZIP archive: {e}", resume_id=resume_id)
+    return entries
+
+def stream_bulk_analysis(entries, job_description):
+    """
+    Yields one record per bulk entry as soon as it is analyzed, then a summary.
+    Text extraction runs in the process pool with at most two files per worker in
+    flight; whatever has finished extracting is then parsed with one nlp.pipe call
+    and embedded with one encoder call per batch. A file that fails only produces
+    an error record for itself. A file is read (a ZIP member decompressed) only when
+    it is submitted and dropped once extracted. A file still extracting 2 x
+    EXTRACTION_TIMEOUT after its submission (it may queue behind one other file) has
+    its worker processes killed and fails; the other files on them are resubmitted.
+    """
+    start = time.perf_counter()
+    counts = {"ok": 0, "error": 0}
+
+    def record(entry, result=None, error=None):
+        counts["error" if error else "ok"] += 1
+        item = {"index": entry["index"], "upload": entry["upload"], "filename": entry["filename"]}
+        if entry["resume_id"]:
+            item["resumeId"] = entry["resume_id"]
+        item.update({"status": "error", "error": error} if error else {"status": "ok", "result": result})
+        return item
+
+    def analyzed(entry, resume_artifacts):
+        try:
+            add_to_resume_index(resume_artifacts, entry["resume_id"], entry["filename"])
+            return record(entry, build_analysis_response(resume_artifacts, job_description["text"], job_description))
+        except Exception as e:
+            app.logger.error(f"Error analyzing {entry['filename']}: {e}", exc_info=True)
+            return record(entry, error=f"An error occurred during processing: {str(e)}")
+
+    queued = iter(entries)
+    pending = {}  # future -> (entry, executor, deadline)
+    max_in_flight = BULK_EXTRACT_WORKERS * 2
+    time_limit = EXTRACTION_TIMEOUT * 2
+
+    def submit(entry):
+        executor = bulk_extraction_pool.get()
+        try:
+            future = executor.submit(extract_document_text, entry["data"], entry["file_extension"], **pdf_extraction_limits())
+        except BrokenProcessPool:
+            bulk_extraction_pool.reset(executor)
+            executor = bulk_extraction_pool.get()
+            future = executor.submit(extract_document_text, entry["data"], entry["file_extension"], **pdf_extraction_limits())
+        pending[future] = (entry, executor, time.monotonic() + time_limit if time_limit else None)
+
+    while True:
+        # Keep the pool busy without holding every file in its queue
+        for entry in queued:
+            if entry["error"]:
+                yield record(entry, error=entry["error"])
+                continue
+            try:
+                data = entry.pop("read")()
+            except Exception as e:
+                logging.error(f"Bulk upload read error for {entry['filename']}: {e}")
+                yield record(entry, error=f"Could not read file: {e}")
+                continue
+            entry["analysis_id"] = hash_bytes(ANALYSIS_VERSION, data)
+            entry["content_hash"] = hash_bytes(data)
+            resume_artifacts = resume_cache.get(entry["analysis_id"])
+            if resume_artifacts is not None:
+                yield analyzed(entry, resume_artifacts)
+                continue
+            entry["data"] = data
+            submit(entry)
+            if len(pending) >= max_in_flight:
+                break
+        if not pending:
+            break
+
+        deadlines = [deadline for _, _, deadline in pending.values() if deadline is not None]
+        timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            # A file ran past its limit: kill its workers, fail it and resubmit the others that were on them
+            now = time.monotonic()
+            killed = {executor for _, executor, deadline in pending.values() if deadline is not None and deadline <= now}
+            for executor in killed:
+                bulk_extraction_pool.kill(executor)
+            for future, (entry, executor, deadline) in list(pending.items()):
+                if executor not in killed or (future.done() and not future.cancelled()
+                                              and not isinstance(future.exception(), BrokenProcessPool)):
+                    continue  # Finished before the kill
+                del pending[future]
+                if deadline <= now:
+                    del entry["data"]
+                    yield record(entry, error="Text extraction timed out")
+                else:
+                    submit(entry)
+            continue
+
+        extracted = []
+        for future in sorted(done, key=lambda f: pending[f][0]["index"]):
+            entry, executor, _ = pending.pop(future)
+            del entry["data"]
+            try:
+                info = future.result()
+            except BrokenProcessPool:
+                bulk_extraction_pool.reset(executor)
+                yield record(entry, error="Text extraction worker crashed")
+                continue
+            except Exception as e:
+                logging.error(f"Bulk text extraction error for {entry['filename']}: {e}")
+                yield record(entry, error="Failed to extract text from resume.")
+                continue
+            if not info["text"]:
+                yield record(entry, error="Failed to extract text from resume.")
+                continue
+            extracted.append((entry, info))
+
+        for batch_start in range(0, len(extracted), BULK_BATCH_SIZE):
+            batch = extracted[batch_start:batch_start + BULK_BATCH_SIZE]
+            try:
+                artifacts = build_resume_artifacts_batch([info.pop("text") for _, info in batch])
+            except Exception as e:
+                app.logger.error(f"Error processing bulk batch: {e}", exc_info=True)
+                for entry, _ in batch:
+                    yield record(entry, error=f"An error occurred during processing: {str(e)}")
+                continue
+            for (entry, info), resume_artifacts in zip(batch, artifacts):
+                resume_artifacts["analysis_id"] = entry["analysis_id"]
+                resume_artifacts["content_hash"] = entry["content_hash"]
+                resume_artifacts["extraction"] = info
+                if models_ready():
+                    resume_cache.set(resume_artifacts["analysis_id"], resume_artifacts)
+                yield analyzed(entry, resume_artifacts)
+
+    yield {
+        "status": "summary",
+        "total": len(entries),
+        "succeeded": counts["ok"],
+        "failed": counts["error"],
+        "took_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+def build_resume_artifacts_batch(texts):
+    """
+    build_resume_artifacts for many resumes: one nlp.pipe call over all texts and
+    one encoder call over their distinct keywords.
+    """
+    keyword_lists, span_keyword_dicts, _ = extract_resume_keywords(texts)
+
+    embedding_lists = [None] * len(texts)
+    distinct_keywords = list(dict.fromkeys(keyword for keywords in keyword_lists for keyword in keywords))
+    if distinct_keywords and sentence_model.get():
+        with stage_timer(None, "resume_embeddings"):
+            embeddings = normalize_embeddings(embedding_cache.encode(distinct_keywords, keyword_encoder()))
+        rows = {keyword: row for row, keyword in enumerate(distinct_keywords)}
+        embedding_lists = [embeddings[[rows[keyword] for keyword in keywords]] if keywords else None
+                           for keywords in keyword_lists]
+
+    return [finish_resume_artifacts(text, keywords, resume_embeddings, span_keywords)
+            for text, keywords, resume_embeddings, span_keywords
+            in zip(texts, keyword_lists, embedding_lists, span_keyword_dicts)]
+
 # Add these helper functions to support the enhanced route:
 
-def extract_resume_structured_data(resume_text):
+def extract_resume_structured_data(resume_text, parsed_resume=None):
     """Extract structured data from resume text."""
+    parsed_resume = parsed_resume or ParsedResume(resume_text)
     try:
         structured_data = {
-            "personalInfo": extract_personal_info(resume_text),
-            "education": extract_education_details(resume_text),
-            "experience": extract_experience_details(resume_text),
-            "skills": extract_skills_list(resume_text),
-            "certifications": extract_certifications(resume_text)
+            "personalInfo": extract_personal_info(resume_text, parsed_resume),
+            "education": extract_education_details(resume_text, parsed_resume),
+            "experience": extract_experience_details(resume_text, parsed_resume),
+            "skills": extract_skills_list(resume_text, parsed_resume),
+            "certifications": extract_certifications(resume_text, parsed_resume)
         }
         return structured_data
     except Exception as e:
         logging.error(f"Error extracting structured data: {e}")
         return {}
 
-def extract_personal_info(text):
+PHONE_PATTERNS = [
+    re.compile(r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    re.compile(r'\(\d{3}\)\s?\d{3}-?\d{4}')
+]
+NOT_A_NAME_PATTERN = re.compile(r'@|\.com|phone|email|\d')
+
+def extract_personal_info(text, parsed_resume=None):
     """Extract personal information from resume."""
     info = {}
+    parsed_resume = parsed_resume or ParsedResume(text)
     
     # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
+    email_match = EMAIL_PATTERN.search(text)
     if email_match:
         info["email"] = email_match.group()
     
     # Extract phone
-    phone_patterns = [
-        r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
-        r'\(\d{3}\)\s?\d{3}-?\d{4}'
-    ]
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text)
+    for pattern in PHONE_PATTERNS:
+        phone_match = pattern.search(text)
         if phone_match:
             info["phone"] = phone_match.group()
             break
     
     # Extract name (simple heuristic - first line that looks like a name)
-    lines = text.split('\n')
-    for line in lines[:5]:  # Check first 5 lines
-        line = line.strip()
+    for line in parsed_resume.stripped_lines[:5]:  # Check first 5 lines
         if line and len(line.split()) <= 4 and len(line) > 5:
-            if not re.search(r'@|\.com|phone|email|\d', line.lower()):
+            if not NOT_A_NAME_PATTERN.search(line.lower()):
                 info["name"] = line
                 break
     
     return info
 
-def extract_education_details(text):
+def extract_education_details(text, parsed_resume=None):
     """Extract education information."""
     education = []
     
     # Look for education section
-    education_section = extract_section_content(text, ['education', 'academic background'])
+    education_section = (parsed_resume or ParsedResume(text)).sections.section("education")
     if not education_section:
         return education
     
@@ -590,12 +1929,12 @@ def extract_education_details(text):
     
     return education
 
-def extract_experience_details(text):
+def extract_experience_details(text, parsed_resume=None):
     """Extract work experience information."""
     experience = []
     
     # Look for experience section
-    exp_section = extract_section_content(text, ['experience', 'work experience', 'employment'])
+    exp_section = (parsed_resume or ParsedResume(text)).sections.section("experience")
     if not exp_section:
         return experience
     
@@ -630,32 +1969,18 @@ def extract_experience_details(text):
     
     return experience
 
-def extract_skills_list(text):
+def extract_skills_list(text, parsed_resume=None):
     """Extract skills from resume."""
-    skills_section = extract_section_content(text, ['skills', 'technical skills', 'competencies'])
+    skills_section = (parsed_resume or ParsedResume(text)).sections.section("skills")
     if not skills_section:
         return []
     
-    # Common technical skills
-    common_skills = [
-        'python', 'java', 'javascript', 'react', 'node', 'sql', 'aws', 'azure',  'mern','spring boot' ,'django','nextjs', 'vue','angular','.net','nodejs','expressjs',
-        'docker', 'kubernetes', 'git', 'linux', 'agile', 'scrum', 'html', 'css','flask','sonerqueue','selenium','php','laveral','c++','c','kotlin','react-native','flutter',
-        'mongodb', 'mysql', 'postgresql', 'redis', 'elasticsearch', 'tensorflow','powerbi','pandas','numpy','openai','wordpress','back-end',
-        'pytorch', 'machine learning', 'data science', 'artificial intelligence','REST API','javascript familiarity','database'
-    ]
-    
-    found_skills = []
-    text_lower = skills_section.lower()
-    
-    for skill in common_skills:
-        if skill in text_lower:
-            found_skills.append(skill.title())
-    
-    return found_skills
+    # Skills from the taxonomy, by canonical name; ambiguous names like "go" count here
+    return skill_taxonomy.get().skill_names(skills_section, include_ambiguous=True)
 
-def extract_certifications(text):
+def extract_certifications(text, parsed_resume=None):
     """Extract certifications from resume."""
-    cert_section = extract_section_content(text, ['certifications', 'certificates', 'qualifications'])
+    cert_section = (parsed_resume or ParsedResume(text)).sections.section("certifications")
     if not cert_section:
         return []
     
@@ -673,19 +1998,6 @@ def extract_certifications(text):
     
     return certifications
 
-def extract_section_content(text, section_keywords):
-    """Extract content from a specific section."""
-    text_lower = text.lower()
-    
-    for keyword in section_keywords:
-        # Find section start
-        pattern = rf'{keyword}[:\s]+(.*?)(?=\n\s*\n|\n[A-Z][A-Za-z\s]+:|\Z)'
-        match = re.search(pattern, text_lower, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-    
-    return ""
-
 def find_missing_keywords(jd_keywords, resume_keywords):
     """Find keywords from job description that are missing in resume."""
     if not jd_keywords or not resume_keywords:
@@ -749,4 +2061,9 @@ def generate_comprehensive_feedback(score, matched_details, format_issues, missi
     if format_issues:
         feedback_parts.append(f"Address {len(format_issues)} formatting issues for better presentation.")
     
-    return " ".join(feedback_parts)
\ No newline at end of file
+    return " ".join(feedback_parts)
+
+if MODEL_WARMUP == '1':
+    warm_up()
+elif MODEL_WARMUP == 'background':
+    threading.Thread(target=warm_up, name="model-warmup", daemon=True).start()
@@ -0,0 +1,138 @@
+import time
+import threading
+
+import numpy as np
+
+
+class _EncodeRequest:
+    __slots__ = ("texts", "queued_at", "done", "result", "error")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.queued_at = time.perf_counter()
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class EncodeBatcher:
+    """
+    Merges encode() calls from concurrent threads into shared forward passes.
+
+    Each caller queues its phrases and waits. One waiting caller at a time collects
+    a batch: it takes the queue once it holds max_batch_size phrases, once every
+    caller expected to encode right now (`expected_callers()`, e.g. the analyses
+    running in this worker) has queued, or once the oldest request has waited
+    max_wait seconds. The distinct phrases of the batch are encoded in one model
+    call and each caller gets its own rows back, in order. A single request is
+    never split, so it may exceed max_batch_size on its own.
+
+    It has the encode() signature of a SentenceTransformer, so it can be passed
+    wherever the model is. `on_batch(requests, phrases, queue_waits)` is called
+    after every model call, e.g. to record metrics.
+    """
+
+    def __init__(self, get_model, max_batch_size=256, max_wait=0.005, expected_callers=None, on_batch=None):
+        self.get_model = get_model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.expected_callers = expected_callers
+        self.on_batch = on_batch
+        self.batches = 0
+        self.requests = 0
+        self.phrases = 0
+        self._queue = []
+        self._queued_phrases = 0
+        self._collecting = False
+        self._condition = threading.Condition()
+
+    def encode(self, texts, convert_to_tensor=False, **kwargs):
+        request = _EncodeRequest(list(texts))
+        if not request.texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        with self._condition:
+            self._queue.append(request)
+            self._queued_phrases += len(request.texts)
+            self._condition.notify_all()
+
+        while True:
+            with self._condition:
+                while self._collecting and not request.done:
+                    self._condition.wait()
+                if request.done:
+                    break
+                self._collecting = True
+                try:
+                    batch = self._take_batch(request)
+                finally:
+                    self._collecting = False
+                    self._condition.notify_all()
+            if batch:
+                self._run(batch)
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _ready(self):
+        if self._queued_phrases >= self.max_batch_size:
+            return True
+        if self.expected_callers is not None and len(self._queue) >= self.expected_callers():
+            return True
+        return time.perf_counter() - self._queue[0].queued_at >= self.max_wait
+
+    def _take_batch(self, request):
+        """Waits (with the lock held) until a batch is due and removes it from the queue."""
+        while not request.done:
+            if not self._queue:
+                # Our request was taken by another collector; wait for its result
+                self._condition.wait()
+                continue
+            if self._ready():
+                break
+            self._condition.wait(max(self._queue[0].queued_at + self.max_wait - time.perf_counter(), 0))
+        else:
+            return []
+
+        batch = []
+        size = 0
+        while self._queue and (not batch or size + len(self._queue[0].texts) <= self.max_batch_size):
+            taken = self._queue.pop(0)
+            batch.append(taken)
+            size += len(taken.texts)
+        self._queued_phrases -= size
+        return batch
+
+    def _run(self, batch):
+        started = time.perf_counter()
+        queue_waits = [started - request.queued_at for request in batch]
+        distinct = list(dict.fromkeys(text for request in batch for text in request.texts))
+        try:
+            encoded = np.asarray(self.get_model().encode(distinct, convert_to_tensor=False), dtype=np.float32)
+            rows = {text: i for i, text in enumerate(distinct)}
+            for request in batch:
+                request.result = encoded[[rows[text] for text in request.texts]]
+        except Exception as e:
+            for request in batch:
+                request.error = e
+
+        with self._condition:
+            for request in batch:
+                request.done = True
+            self.batches += 1
+            self.requests += len(batch)
+            self.phrases += len(distinct)
+            self._condition.notify_all()
+        if self.on_batch is not None:
+            self.on_batch(len(batch), len(distinct), queue_waits)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "phrases": self.phrases,
+                "queued": len(self._queue),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
@@ -0,0 +1,109 @@
+"""
+Recall/latency report for exact vs approximate (IVF) keyword matching.
+
+Builds a fixture corpus of clustered unit-length embeddings (a stand-in for a
+large JD/skill vocabulary, fixed seed) and, for each vocabulary size, compares:
+- full: the full resume x vocabulary matrix with argmax (the old behaviour)
+- exact: ann.exact_best_matches, blocked so the full matrix never exists
+- ivf: ann.IVFIndex at several n_probe values
+Recall@1 is the share of resume keywords whose best match equals the exact one;
+"decisions" is the share whose above/below MATCH_THRESHOLD outcome agrees.
+
+Usage (from the ai-service directory):
+    python benchmarks/bench_ann.py [--vocab 1000 10000 50000] [--queries 500] [--json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ann import IVFIndex, exact_best_matches
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+MATCH_THRESHOLD = 0.6  # Same default as app.MATCH_THRESHOLD
+
+
+def unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def make_fixture(vocab_size, query_count, rng, topics=500, spread=1.2):
+    """Keywords cluster around topics, like skill phrases around technology areas."""
+    centers = unit(rng.standard_normal((topics, EMBEDDING_DIM)).astype(np.float32))
+    vocab = unit(centers[rng.integers(0, topics, vocab_size)]
+                 + spread * unit(rng.standard_normal((vocab_size, EMBEDDING_DIM)).astype(np.float32)))
+    queries = unit(centers[rng.integers(0, topics, query_count)]
+                   + spread * unit(rng.standard_normal((query_count, EMBEDDING_DIM)).astype(np.float32)))
+    return queries.astype(np.float32), vocab.astype(np.float32)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def full_matrix_best(queries, vocab):
+    matrix = queries @ vocab.T
+    indices = matrix.argmax(axis=1)
+    return indices, matrix[np.arange(len(queries)), indices]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocab", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--probes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    report = []
+    for vocab_size in args.vocab:
+        queries, vocab = make_fixture(vocab_size, args.queries, rng)
+        (full_indices, _), full_ms = timed(full_matrix_best, queries, vocab)
+        (exact_indices, exact_scores), exact_ms = timed(exact_best_matches, queries, vocab)
+        exact_matched = exact_scores >= MATCH_THRESHOLD
+        row = {
+            "vocab_size": vocab_size,
+            "queries": args.queries,
+            "full_matrix_ms": round(full_ms, 2),
+            "full_matrix_mb": round(args.queries * vocab_size * 4 / 2 ** 20, 1),
+            "exact_ms": round(exact_ms, 2),
+            "exact_agrees_with_full": bool((full_indices == exact_indices).all()),
+            "ivf": [],
+        }
+        for n_probe in args.probes:
+            index, build_ms = timed(IVFIndex, vocab, None, n_probe)
+            (indices, scores), search_ms = timed(index.search_best, queries)
+            row["ivf"].append({
+                "n_lists": index.n_lists,
+                "n_probe": index.n_probe,
+                "build_ms": round(build_ms, 2),
+                "search_ms": round(search_ms, 2),
+                "recall_at_1": round(float((indices == exact_indices).mean()), 4),
+                "decision_agreement": round(float(((scores >= MATCH_THRESHOLD) == exact_matched).mean()), 4),
+                "mean_score_loss": round(float((exact_scores - scores).mean()), 4),
+            })
+        report.append(row)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for row in report:
+        print(f"vocab={row['vocab_size']} queries={row['queries']}: full matrix {row['full_matrix_ms']} ms "
+              f"({row['full_matrix_mb']} MB), blocked exact {row['exact_ms']} ms")
+        for ivf in row["ivf"]:
+            print(f"  ivf lists={ivf['n_lists']:<4} probe={ivf['n_probe']:<3} build {ivf['build_ms']:>9} ms  "
+                  f"search {ivf['search_ms']:>8} ms  recall@1 {ivf['recall_at_1']:.3f}  "
+                  f"decisions {ivf['decision_agreement']:.3f}  score loss {ivf['mean_score_loss']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
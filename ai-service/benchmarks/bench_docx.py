@@ -0,0 +1,194 @@
+"""
+DOCX text extraction: python-docx vs the streaming OOXML reader (text_extraction.py).
+
+Documents are synthetic resumes of 1-10 pages (benchmarks/fixtures.py), plain
+and "rich": the same text plus a header and footer, a skills table and
+embedded photos of --image-mb MB each. Each reader runs in a fresh subprocess
+on the same files, so peak RSS is comparable; RSS growth is measured from
+after the files are read.
+
+The streamed text must contain every python-docx paragraph, in order (it
+adds tables, text boxes, headers and footers). Exits 1 on a mismatch, or if
+the streaming reader is slower or uses more memory than python-docx on any
+document.
+
+Usage (from the ai-service directory):
+    python benchmarks/bench_docx.py [--pages 1 5 10] [--images 4] [--image-mb 2] [--repeat 10] [--json]
+"""
+import io
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+READERS = ["python-docx", "ooxml-stream"]
+
+
+def max_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None
+
+
+def python_docx_text(data):
+    """extract_docx_text as it was before the streaming reader."""
+    from docx import Document
+
+    document = Document(io.BytesIO(data))
+    return "\n".join([paragraph.text for paragraph in document.paragraphs])
+
+
+def stream_text(data):
+    from text_extraction import extract_docx_text
+
+    return extract_docx_text(data)["text"]
+
+
+def noise_png(size_mb, seed):
+    """An RGB PNG of random pixels (incompressible), about size_mb MB."""
+    side = int((size_mb * 1024 * 1024 / 3) ** 0.5)
+    pixels = np.random.default_rng(seed).integers(0, 256, (side, side * 3), dtype=np.uint8)
+    raw = b"".join(b"\x00" + row.tobytes() for row in pixels)
+
+    def chunk(kind, payload):
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+
+def rich_docx_bytes(lines, images, image_mb):
+    """Resume lines plus a header, a footer, a skills table and embedded images."""
+    from docx import Document
+    from docx.shared import Inches
+
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = "Jordan Example | jordan.example@example.com | +1 555 010 2030"
+    document.sections[0].footer.paragraphs[0].text = "References available on request"
+    table = document.add_table(rows=3, cols=2)
+    for row, (label, skills) in enumerate([("Languages", "Python, Go, Rust"), ("Cloud", "AWS, Kubernetes, Terraform"),
+                                           ("Data", "PostgreSQL, Kafka, Spark")]):
+        table.cell(row, 0).text = label
+        table.cell(row, 1).text = skills
+    step = max(len(lines) // max(images, 1), 1)
+    for i, line in enumerate(lines):
+        document.add_paragraph(line)
+        if images and i % step == 0 and i // step < images:
+            document.add_picture(io.BytesIO(noise_png(image_mb, seed=i)), width=Inches(1))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def is_subsequence(paragraphs, lines):
+    remaining = iter(lines)
+    return all(any(line == paragraph for line in remaining) for paragraph in paragraphs)
+
+
+def run_reader(args):
+    """Child process: extracts every file with one reader."""
+    with open(args.manifest, encoding="utf-8") as f:
+        files = json.load(f)
+    documents = {}
+    for name, path in files.items():
+        with open(path, "rb") as f:
+            documents[name] = f.read()
+    extract = python_docx_text if args.reader == "python-docx" else stream_text
+
+    rss_before = max_rss_mb()
+    results = {}
+    for name, data in documents.items():
+        extract(data)  # warm-up (imports)
+        durations = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            extract(data)
+            durations.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "size_kb": round(len(data) / 1024, 1),
+            "p50_ms": round(float(np.percentile(durations, 50)), 3),
+            "mean_ms": round(float(np.mean(durations)), 3),
+        }
+    print(json.dumps({"rss_growth_mb": round(max_rss_mb() - rss_before, 1) if resource else None, "cases": results}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--images", type=int, default=4, help="embedded images per rich document")
+    parser.add_argument("--image-mb", type=float, default=2.0)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--reader", choices=READERS, help=argparse.SUPPRESS)
+    parser.add_argument("--manifest", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reader:
+        run_reader(args)
+        return
+
+    import fixtures
+
+    state_dir = tempfile.mkdtemp(prefix="ai-service-bench-")
+    files = {}
+    failures = []
+    for pages in args.pages:
+        lines = fixtures.resume_lines(pages)
+        for variant, data in (("plain", fixtures.docx_bytes(lines)),
+                              ("rich", rich_docx_bytes(lines, args.images, args.image_mb))):
+            name = f"{variant}/{pages}p"
+            path = os.path.join(state_dir, name.replace("/", "-") + ".docx")
+            with open(path, "wb") as f:
+                f.write(data)
+            files[name] = path
+            if not is_subsequence(python_docx_text(data).split("\n"), stream_text(data).split("\n")):
+                failures.append(f"{name}: streamed text is missing python-docx paragraphs")
+    manifest = os.path.join(state_dir, "manifest.json")
+    with open(manifest, "w", encoding="utf-8") as f:
+        json.dump(files, f)
+
+    report = {}
+    for reader in READERS:
+        command = [sys.executable, os.path.abspath(__file__), "--reader", reader, "--manifest", manifest,
+                   "--repeat", str(args.repeat)]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        report[reader] = json.loads(output.strip().splitlines()[-1])
+
+    for name in files:
+        legacy, streamed = (report[reader]["cases"][name] for reader in READERS)
+        if streamed["p50_ms"] > legacy["p50_ms"]:
+            failures.append(f"{name}: streaming reader is slower ({streamed['p50_ms']} vs {legacy['p50_ms']} ms)")
+    legacy_rss, streamed_rss = (report[reader]["rss_growth_mb"] for reader in READERS)
+    if resource and streamed_rss > legacy_rss:
+        failures.append(f"streaming reader grew RSS more ({streamed_rss} vs {legacy_rss} MB)")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'document':<12} {'KB':>9} {'python-docx (ms)':>17} {'ooxml-stream (ms)':>18} {'speedup':>8}")
+        for name in files:
+            legacy, streamed = (report[reader]["cases"][name] for reader in READERS)
+            print(f"{name:<12} {legacy['size_kb']:>9} {legacy['p50_ms']:>17} {streamed['p50_ms']:>18} "
+                  f"{legacy['p50_ms'] / streamed['p50_ms']:>7.1f}x")
+        print(f"\nRSS growth while extracting: python-docx {legacy_rss} MB, ooxml-stream {streamed_rss} MB")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
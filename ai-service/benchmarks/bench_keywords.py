@@ -0,0 +1,120 @@
+"""
+Keyword canonicalization (KEYWORD_CANONICALIZATION, keywords.py) on a fixture set.
+
+For synthetic resumes of 1-10 pages (benchmarks/fixtures.py) against job
+descriptions with 30-300 skill phrases, runs keyword extraction with the stage
+off (the raw candidates, as before) and on, and reports per pair:
+- resume and JD keyword counts, and the similarity matrix size (resume x JD)
+- the time to encode both keyword lists (caches disabled)
+- the match score of each mode and the difference
+
+Exits 1 if any score moves by more than --max-score-delta points. --stub-encoder
+swaps the Sentence-BERT model for a deterministic hash-based encoder, so the
+script runs offline, but scores are only meaningful with the real model; the
+spaCy model must be installed locally.
+
+Usage (from the ai-service directory):
+    python benchmarks/bench_keywords.py [--pages 1 5 10] [--jd-keywords 30 100 300] [--keyword-max 200] [--stub-encoder]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import fixtures
+from bench_pipeline import StubEncoder
+
+
+def load_app(args):
+    """Imports app.py with its caches disabled and on-disk state in a temporary folder."""
+    state_dir = tempfile.mkdtemp(prefix="ai-service-bench-")
+    if args.stub_encoder:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    for name in ("EMBEDDING_CACHE_SIZE", "RESULT_CACHE_SIZE", "RESUME_CACHE_SIZE"):
+        os.environ[name] = "0"
+    os.environ["KEYWORD_MAX"] = str(args.keyword_max)
+    os.environ.setdefault("RESUME_INDEX_ENABLED", "0")
+    os.environ.setdefault("JD_STORE_PATH", os.path.join(state_dir, "job_descriptions.sqlite"))
+    os.environ.setdefault("ASYNC_JOB_STORE_PATH", os.path.join(state_dir, "jobs.sqlite"))
+
+    import app
+    if args.stub_encoder:
+        app.sentence_model.set(StubEncoder())
+    if app.nlp.get() is None:
+        raise SystemExit(f"spaCy model '{app.SPACY_MODEL_NAME}' is not installed "
+                         f"(python -m spacy download {app.SPACY_MODEL_NAME})")
+    if app.sentence_model.get() is None:
+        raise SystemExit(f"Sentence-BERT model '{app.SENTENCE_MODEL_NAME}' is not cached locally; "
+                         "download it once or pass --stub-encoder")
+    return app
+
+
+def analyze(app, mode, resume_text, job_description_text):
+    """Keywords, encode time and score of one resume/JD pair with KEYWORD_CANONICALIZATION=mode."""
+    app.KEYWORD_CANONICALIZATION = mode
+    (resume_keywords,), _, _ = app.extract_resume_keywords([resume_text])
+    jd_keywords = app.extract_keywords_from_text(job_description_text, app.nlp.get())
+
+    model = app.sentence_model.get()
+    start = time.perf_counter()
+    resume_embeddings = app.normalize_embeddings(model.encode(resume_keywords, convert_to_tensor=False))
+    jd_embeddings = app.normalize_embeddings(model.encode(jd_keywords, convert_to_tensor=False))
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    result = app.perform_job_matching(resume_text, job_description_text, resume_keywords, resume_embeddings,
+                                      jd_keywords, jd_embeddings)
+    return {
+        "resume_keywords": len(resume_keywords),
+        "jd_keywords": len(jd_keywords),
+        "cells": len(resume_keywords) * len(jd_keywords),
+        "encode_ms": encode_ms,
+        "score": result.get("matchScore", 0.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--jd-keywords", type=int, nargs="+", default=[30, 100, 300])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--keyword-max", type=int, default=200, help="KEYWORD_MAX for the canonical mode (0 = no cap)")
+    parser.add_argument("--max-score-delta", type=float, default=10.0, help="allowed score change in points")
+    parser.add_argument("--stub-encoder", action="store_true", help="use a deterministic hash encoder instead of Sentence-BERT")
+    args = parser.parse_args()
+    app = load_app(args)
+
+    failures = []
+    totals = {"off": [0, 0.0], "on": [0, 0.0]}
+    print(f"{'fixture':<18} {'resume kw':>11} {'jd kw':>9} {'cells':>15} {'encode (ms)':>15} {'score':>13} {'delta':>6}")
+    for seed in args.seeds:
+        for pages in args.pages:
+            resume_text = "\n".join(fixtures.resume_lines(pages, seed=seed))
+            for keyword_count in args.jd_keywords:
+                job_description_text = fixtures.job_description_text(keyword_count, seed=seed)
+                off = analyze(app, "off", resume_text, job_description_text)
+                on = analyze(app, "on", resume_text, job_description_text)
+                for mode, result in (("off", off), ("on", on)):
+                    totals[mode][0] += result["cells"]
+                    totals[mode][1] += result["encode_ms"]
+                delta = on["score"] - off["score"]
+                name = f"s{seed}/{pages}p/{keyword_count}kw"
+                print(f"{name:<18} {off['resume_keywords']:>5}>{on['resume_keywords']:<5} "
+                      f"{off['jd_keywords']:>4}>{on['jd_keywords']:<4} {off['cells']:>7}>{on['cells']:<7} "
+                      f"{off['encode_ms']:>7.1f}>{on['encode_ms']:<7.1f} {off['score']:>6.1f}>{on['score']:<6.1f} {delta:>+6.1f}")
+                if abs(delta) > args.max_score_delta:
+                    failures.append(f"{name}: score moved {delta:+.1f} points ({off['score']} -> {on['score']})")
+
+    print(f"total matrix cells {totals['off'][0]} -> {totals['on'][0]} "
+          f"({totals['on'][0] / max(totals['off'][0], 1):.0%}), encode time {totals['off'][1]:.0f} -> {totals['on'][1]:.0f} ms")
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
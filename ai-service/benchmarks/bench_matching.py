@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for the keyword best-match step of perform_job_matching.
+
+Compares the original per-call cosine_similarity + nested Python loops with the
+code the service runs: normalize_embeddings, find_best_matches (MATCH_MODE=exact,
+i.e. ann.exact_best_matches over query blocks) and aggregate_best_matches. Exits 1
+if their scores or match details differ. Random embeddings are used, so no models
+are needed.
+
+Usage (from the ai-service directory):
+    python benchmarks/bench_matching.py [--sizes 50 500 2000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["MATCH_MODE"] = "exact"  # The approximate mode is measured by bench_ann.py
+
+from app import MATCH_THRESHOLD, aggregate_best_matches, find_best_matches, normalize_embeddings
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+
+def legacy_cosine_similarity(embeddings1, embeddings2):
+    norms1 = np.linalg.norm(embeddings1, axis=1, keepdims=True)
+    norms2 = np.linalg.norm(embeddings2, axis=1, keepdims=True)
+    return (embeddings1 / norms1) @ (embeddings2 / norms2).T
+
+
+def legacy_job_matching(resume_keywords, jd_keywords, resume_embeddings, jd_embeddings):
+    """The nested-loop aggregation perform_job_matching used before vectorization."""
+    similarity_matrix = legacy_cosine_similarity(resume_embeddings, jd_embeddings)
+    matched_details = []
+    for i, res_kw in enumerate(resume_keywords):
+        best_match_score = 0.0
+        best_jd_kw = ""
+        for j, jd_kw in enumerate(jd_keywords):
+            score = similarity_matrix[i, j]
+            if score > best_match_score:
+                best_match_score = score
+                best_jd_kw = jd_kw
+        if best_match_score >= MATCH_THRESHOLD:
+            matched_details.append({
+                "resume_keyword": res_kw,
+                "jd_match": best_jd_kw,
+                "similarity_score": round(float(best_match_score), 2)
+            })
+    overall_match_score = (sum([d['similarity_score'] for d in matched_details]) / len(jd_keywords)) * 100
+    return round(min(overall_match_score, 100.0), 2), matched_details
+
+
+def vectorized_job_matching(resume_keywords, jd_keywords, resume_embeddings, jd_embeddings):
+    """Steps 2-3 of perform_job_matching as the service runs them."""
+    best_jd_indices, best_match_scores = find_best_matches(
+        normalize_embeddings(resume_embeddings), normalize_embeddings(jd_embeddings), jd_keywords
+    )
+    result = aggregate_best_matches(resume_keywords, jd_keywords, best_jd_indices, best_match_scores)
+    return result["matchScore"], result["matched_details"]
+
+
+def make_inputs(size, rng):
+    # Correlated embeddings so a realistic share of keywords clears the threshold
+    base = rng.standard_normal((size, EMBEDDING_DIM)).astype(np.float32)
+    resume_embeddings = base + 0.3 * rng.standard_normal((size, EMBEDDING_DIM)).astype(np.float32)
+    jd_embeddings = base[rng.permutation(size)] + 0.3 * rng.standard_normal((size, EMBEDDING_DIM)).astype(np.float32)
+    resume_keywords = [f"resume keyword {i}" for i in range(size)]
+    jd_keywords = [f"jd keyword {i}" for i in range(size)]
+    return resume_keywords, jd_keywords, resume_embeddings, jd_embeddings
+
+
+def best_time(func, args, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'keywords':>9} {'legacy (ms)':>12} {'service (ms)':>16} {'speedup':>8}")
+    for size in args.sizes:
+        inputs = make_inputs(size, rng)
+        legacy_score, legacy_details = legacy_job_matching(*inputs)
+        score, details = vectorized_job_matching(*inputs)
+        if legacy_score != score or legacy_details != details:
+            raise SystemExit(f"find_best_matches result differs from the legacy loop at {size} keywords")
+
+        legacy_seconds = best_time(legacy_job_matching, inputs, args.repeat)
+        vectorized_seconds = best_time(vectorized_job_matching, inputs, args.repeat)
+        print(f"{size:>9} {legacy_seconds * 1000:>12.2f} {vectorized_seconds * 1000:>16.2f} "
+              f"{legacy_seconds / vectorized_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
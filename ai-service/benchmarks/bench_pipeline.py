@@ -0,0 +1,272 @@
+"""
+Benchmark of the resume analysis pipeline, stage by stage and end to end.
+
+Generates synthetic PDF/DOCX resumes of 1-10 pages and job descriptions with
+50-2000 skill phrases (benchmarks/fixtures.py, fixed seed), then times:
+- each stage: text_extraction, resume_keywords, jd_keywords, resume_encode,
+  jd_encode, matching, format_check, structured_data
+- all resume-only work (resume_artifacts), and the same after a one-line edit
+  when the previous revision's artifacts are passed in (resume_reanalysis; the
+  earlier revision is only reused with INCREMENTAL_REANALYSIS=1 in the environment)
+- the full POST /analyze-resume-jd request through Flask's test client
+and reports throughput, p50/p95/p99 latency and peak traced memory per case as JSON.
+
+Caches are disabled by default (each iteration does the full work); pass
+--warm-caches to measure the cached path. --stub-encoder swaps the
+Sentence-BERT model for a deterministic hash-based encoder, so the suite runs
+offline; the spaCy model must be installed locally.
+
+Usage (from the ai-service directory):
+    python benchmarks/bench_pipeline.py [--pages 1 5 10] [--jd-keywords 50 500 2000] [--stub-encoder]
+    python benchmarks/bench_pipeline.py --output benchmarks/baseline.json     # record a baseline
+    python benchmarks/bench_pipeline.py --compare benchmarks/baseline.json    # exit 1 on regressions
+"""
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import fixtures
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+
+class StubEncoder:
+    """Deterministic stand-in for SentenceTransformer: one seeded random unit vector per phrase."""
+
+    def encode(self, texts, convert_to_tensor=False, **kwargs):
+        vectors = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+            vectors[i] = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def load_app(args):
+    """Imports app.py with caches and on-disk state pointed away from the instance folder."""
+    state_dir = tempfile.mkdtemp(prefix="ai-service-bench-")
+    if args.stub_encoder:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    if not args.warm_caches:
+        for name in ("EMBEDDING_CACHE_SIZE", "RESULT_CACHE_SIZE", "RESUME_CACHE_SIZE"):
+            os.environ[name] = "0"
+    os.environ.setdefault("RESUME_INDEX_ENABLED", "0")
+    os.environ.setdefault("RESUME_INDEX_DIR", os.path.join(state_dir, "resume_index"))
+    os.environ.setdefault("JD_STORE_PATH", os.path.join(state_dir, "job_descriptions.sqlite"))
+    os.environ.setdefault("ASYNC_JOB_STORE_PATH", os.path.join(state_dir, "jobs.sqlite"))
+
+    import app
+    if args.stub_encoder:
+        app.sentence_model.set(StubEncoder())
+    if app.nlp.get() is None:
+        raise SystemExit(f"spaCy model '{app.SPACY_MODEL_NAME}' is not installed "
+                         f"(python -m spacy download {app.SPACY_MODEL_NAME})")
+    if app.sentence_model.get() is None:
+        raise SystemExit(f"Sentence-BERT model '{app.SENTENCE_MODEL_NAME}' is not cached locally; "
+                         "download it once or pass --stub-encoder")
+    return app
+
+
+def measure(func, repeat, warmup=1):
+    """Times `repeat` calls of func, then one extra call under tracemalloc for peak memory."""
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    durations_ms = np.array(durations) * 1000
+    return {
+        "repeat": repeat,
+        "throughput_per_s": round(repeat / sum(durations), 2),
+        "mean_ms": round(float(durations_ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(durations_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(durations_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(durations_ms, 99)), 3),
+        "peak_traced_kb": round(peak / 1024, 1),
+    }
+
+
+def resume_stage_cases(app, file_format, pages, repeat):
+    """Stages that depend only on the resume."""
+    document = fixtures.resume_document(pages, file_format)
+    extension = "." + file_format
+    text = app.extract_text_from_doc(io.BytesIO(document), extension)
+    (keywords,), _, _ = app.extract_resume_keywords([text])
+    previous = app.build_resume_artifacts(text)
+    lines = text.split("\n")
+    lines[len(lines) // 2] += " led the migration to rust and grpc"
+    revised = "\n".join(lines)
+    prefix = f"resume/{file_format}/{pages}p"
+    sizes = {"document_bytes": len(document), "text_chars": len(text), "keywords": len(keywords)}
+
+    cases = {
+        "text_extraction": lambda: app.extract_text_from_doc(io.BytesIO(document), extension),
+        "resume_keywords": lambda: app.extract_resume_keywords([text]),
+        "resume_encode": lambda: app.normalize_embeddings(app.sentence_model.get().encode(keywords, convert_to_tensor=False)),
+        "format_check": lambda: app.check_resume_format(text),
+        "structured_data": lambda: app.extract_resume_structured_data(text),
+        "resume_artifacts": lambda: app.build_resume_artifacts(text),
+        "resume_reanalysis": lambda: app.build_resume_artifacts(revised, previous_artifacts=previous),
+    }
+    return {f"{prefix}/{stage}": dict(measure(func, repeat), **sizes) for stage, func in cases.items()}
+
+
+def jd_stage_cases(app, keyword_count, resume_keywords, resume_embeddings, repeat):
+    """Stages that depend on the job description, matched against a fixed resume."""
+    text = fixtures.job_description_text(keyword_count)
+    keywords = app.extract_keywords_from_text(text, app.nlp.get())
+    embeddings = app.normalize_embeddings(app.sentence_model.get().encode(keywords, convert_to_tensor=False))
+    prefix = f"jd/{keyword_count}kw"
+    sizes = {"text_chars": len(text), "keywords": len(keywords), "resume_keywords": len(resume_keywords)}
+
+    def matching():
+        best_indices, best_scores = app.find_best_matches(resume_embeddings, embeddings, keywords)
+        return app.aggregate_best_matches(resume_keywords, keywords, best_indices, best_scores)
+
+    cases = {
+        "jd_keywords": lambda: app.extract_keywords_from_text(text, app.nlp.get()),
+        "jd_encode": lambda: app.normalize_embeddings(app.sentence_model.get().encode(keywords, convert_to_tensor=False)),
+        "matching": matching,
+    }
+    return {f"{prefix}/{stage}": dict(measure(func, repeat), **sizes) for stage, func in cases.items()}
+
+
+def endpoint_cases(app, file_format, pages, keyword_count, repeat):
+    """The full /analyze-resume-jd request through the Flask test client."""
+    client = app.app.test_client()
+    document = fixtures.resume_document(pages, file_format)
+    job_description = fixtures.job_description_text(keyword_count)
+
+    def post():
+        response = client.post("/analyze-resume-jd", data={
+            "resume": (io.BytesIO(document), f"resume.{file_format}"),
+            "jobDescription": job_description,
+        }, content_type="multipart/form-data")
+        if response.status_code != 200:
+            raise RuntimeError(f"/analyze-resume-jd returned {response.status_code}: {response.get_data(as_text=True)}")
+
+    name = f"endpoint/{file_format}/{pages}p/{keyword_count}kw"
+    return {name: measure(post, repeat)}
+
+
+def compare(report, baseline, tolerance, min_delta_ms):
+    """Flags cases whose p50/p95 latency or peak memory grew by more than `tolerance`."""
+    regressions = []
+    print(f"{'case':<45} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, current in sorted(report["results"].items()):
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_traced_kb"):
+            before, after = previous[metric], current[metric]
+            if not before:
+                continue
+            change = after / before - 1
+            noise_floor = min_delta_ms if metric.endswith("_ms") else 0
+            regressed = change > tolerance and after - before > noise_floor
+            if regressed:
+                regressions.append((name, metric, before, after))
+            marker = "  REGRESSION" if regressed else ""
+            print(f"{name:<45} {metric:<15} {before:>10} {after:>10} {change:>+7.0%}{marker}")
+
+    missing = sorted(set(baseline["results"]) - set(report["results"]))
+    if missing:
+        print(f"{len(missing)} baseline case(s) not run: {', '.join(missing[:5])}{' ...' if len(missing) > 5 else ''}")
+    if baseline.get("environment", {}).get("encoder") != report["environment"]["encoder"]:
+        print("warning: baseline was recorded with a different encoder; latencies are not comparable")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--jd-keywords", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--formats", nargs="+", choices=["pdf", "docx"], default=["pdf", "docx"])
+    parser.add_argument("--repeat", type=int, default=20, help="timed iterations per stage")
+    parser.add_argument("--endpoint-repeat", type=int, default=10, help="timed iterations per endpoint case")
+    parser.add_argument("--stub-encoder", action="store_true", help="use a deterministic hash encoder instead of Sentence-BERT")
+    parser.add_argument("--warm-caches", action="store_true", help="keep the app's caches enabled")
+    parser.add_argument("--output", help="write the JSON report to this file (e.g. to store a baseline)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with a stored report and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown (default 0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    app = load_app(args)
+    results = {}
+
+    for file_format in args.formats:
+        for pages in args.pages:
+            results.update(resume_stage_cases(app, file_format, pages, args.repeat))
+
+    # JD-side stages are matched against the keywords of the largest resume
+    resume_text = "\n".join(fixtures.resume_lines(max(args.pages)))
+    resume_keywords = app.extract_keywords_from_text(resume_text, app.nlp.get())
+    resume_embeddings = app.normalize_embeddings(app.sentence_model.get().encode(resume_keywords, convert_to_tensor=False))
+    for keyword_count in args.jd_keywords:
+        results.update(jd_stage_cases(app, keyword_count, resume_keywords, resume_embeddings, args.repeat))
+
+    for file_format in args.formats:
+        for pages in args.pages:
+            for keyword_count in args.jd_keywords:
+                results.update(endpoint_cases(app, file_format, pages, keyword_count, args.endpoint_repeat))
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "encoder": "stub" if args.stub_encoder else app.SENTENCE_MODEL_NAME,
+            "spacy_model": app.SPACY_MODEL_NAME,
+            "warm_caches": args.warm_caches,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+        print("No regressions.")
+    elif not args.output:
+        print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark for resume section lookup (sections.py).
+
+Compares the original lookup (one lowercase copy and one lazy DOTALL regex per
+section keyword, for every extractor and missing-section check) with the section
+map computed once per document by SectionSegmenter. Inputs are synthetic resumes
+(benchmarks/fixtures.py), messy variants (CRLF line ends, long whitespace runs,
+section keywords inside other words and sentences, headings without blank lines,
+repeated headings) and text where section keywords occur often but never as a
+heading. Each input is repeated to grow it; the time per KB must not grow.
+
+Every input is first checked for identical section contents and missing-section
+results. Exits 1 on a mismatch, or if the segmenter's time per KB on the largest
+input grows more than --max-growth times over the smallest (i.e. not linear).
+
+Usage (from the ai-service directory):
+    python benchmarks/bench_sections.py [--copies 1 4 16 64] [--repeat 5] [--max-growth 3]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import fixtures
+from format_rules import SECTION_CHECK_KEYWORDS, SECTION_SEGMENTER
+from sections import SECTION_KEYWORDS
+
+
+def legacy_section_content(text, section_keywords):
+    """extract_section_content as it was before the segmenter."""
+    text_lower = text.lower()
+    for keyword in section_keywords:
+        pattern = rf'{keyword}[:\s]+(.*?)(?=\n\s*\n|\n[A-Z][A-Za-z\s]+:|\Z)'
+        match = re.search(pattern, text_lower, re.DOTALL)
+        if match:
+            return match.group(1).strip()
+    return ""
+
+
+def legacy_sections(text):
+    contents = {name: legacy_section_content(text, keywords) for name, keywords in SECTION_KEYWORDS.items()}
+    lower = text.lower()
+    present = {name: re.search("|".join(re.escape(keyword) for keyword in keywords), lower) is not None
+               for name, keywords in SECTION_CHECK_KEYWORDS.items()}
+    return contents, present
+
+
+def segmented_sections(text):
+    section_map = SECTION_SEGMENTER.segment(text.lower())
+    contents = {name: section_map.section(name) for name in SECTION_KEYWORDS}
+    present = {name: section_map.mentions_any(keywords) for name, keywords in SECTION_CHECK_KEYWORDS.items()}
+    return contents, present
+
+
+def messy_resume(rng):
+    """A resume with the formatting problems PDF and DOCX extraction produce."""
+    lines = fixtures.resume_lines(2, seed=rng.randint(0, 1000))
+    messy = [
+        "Experienced engineer; skillset spans education technology and employment law.",
+        "SKILLS:" + " " * 400 + "python, go, rust",
+        "Work Experience\t\t" + "\t" * 200,
+        "Technical Skills - " + ", ".join(["kubernetes"] * 50),
+        "Certificates" + "\n" + " \t " * 100 + "\n",
+        "professional experience" * 20,
+        "About me: " + "x" * 2000,
+        "Education" + "\n" * 30 + "Example University",
+    ]
+    for line in messy:
+        lines.insert(rng.randint(0, len(lines)), line)
+    return "\r\n".join(lines)
+
+
+def best_time(func, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="allowed growth of the segmenter's time per KB from the smallest to the largest input")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    inputs = {
+        "clean": "\n".join(fixtures.resume_lines(3)),
+        "messy": messy_resume(rng),
+        "no blank lines": "\n".join(line for line in fixtures.resume_lines(3) if line),
+        "no headings": " ".join(["experienced skillsets,educational employments;competenciesx"] * 200),
+    }
+
+    failures = []
+    print(f"{'input':<16} {'copies':>6} {'KB':>8} {'legacy (ms)':>12} {'segmenter (ms)':>15} {'us/KB':>7} {'speedup':>8}")
+    for name, base in inputs.items():
+        per_kb = []
+        for copies in args.copies:
+            text = "\n\n".join([base] * copies)
+            if legacy_sections(text) != segmented_sections(text):
+                failures.append(f"{name} x{copies}: segmenter result differs from the legacy lookup")
+                continue
+            legacy_seconds = best_time(legacy_sections, text, args.repeat)
+            seconds = best_time(segmented_sections, text, args.repeat)
+            kilobytes = len(text) / 1024
+            per_kb.append(seconds / kilobytes)
+            print(f"{name:<16} {copies:>6} {kilobytes:>8.1f} {legacy_seconds * 1000:>12.3f} {seconds * 1000:>15.3f} "
+                  f"{seconds / kilobytes * 1e6:>7.2f} {legacy_seconds / seconds:>7.1f}x")
+        if len(per_kb) > 1 and per_kb[-1] > per_kb[0] * args.max_growth:
+            failures.append(f"{name}: time per KB grew {per_kb[-1] / per_kb[0]:.1f}x from the smallest input")
+
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Latency and memory of the spaCy keyword-extraction pass, old loader vs new.
+
+Variants (each measured in a fresh subprocess, so peak RSS is comparable):
+- full: spacy.load(model) with every component, resume and JD parsed by two nlp() calls
+- excluded: unused components excluded at load time, still two nlp() calls
+- excluded_pipe: unused components excluded, resume and JD parsed in one nlp.pipe call
+Inputs are the synthetic resumes (1/5/10 pages) and job descriptions (50/500/2000
+skill phrases) from benchmarks/fixtures.py. Each variant also hashes the noun
+chunks and POS tags keyword extraction reads, to check the outputs are identical.
+
+Usage (from the ai-service directory; needs the spaCy model installed):
+    python benchmarks/bench_spacy.py [--pages 1 5 10] [--jd-keywords 50 500 2000] [--repeat 5] [--json]
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARK_DIR)
+
+import fixtures
+
+VARIANTS = ["full", "excluded", "excluded_pipe"]
+
+
+def max_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None
+
+
+def doc_signature(doc):
+    """Hash of what extract_keywords_from_text reads from a parsed doc."""
+    digest = hashlib.sha256()
+    for chunk in doc.noun_chunks:
+        digest.update(chunk.text.encode("utf-8") + b"\x00")
+    for token in doc:
+        digest.update(f"{token.text}\x01{token.pos_}\x01{token.is_stop}\x00".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def run_variant(args):
+    """Child process: loads the model one way and times every resume/JD pair."""
+    import spacy
+
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    exclude = args.exclude if args.variant != "full" else []
+    nlp = spacy.load(args.model, exclude=exclude)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    results = {}
+    for pages in args.pages:
+        resume_text = "\n".join(fixtures.resume_lines(pages)).lower()
+        for keyword_count in args.jd_keywords:
+            jd_text = fixtures.job_description_text(keyword_count).lower()
+
+            def parse():
+                if args.variant == "excluded_pipe":
+                    return list(nlp.pipe([resume_text, jd_text], batch_size=args.batch_size))
+                return [nlp(resume_text), nlp(jd_text)]
+
+            docs = parse()  # warm-up
+            durations = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                parse()
+                durations.append((time.perf_counter() - start) * 1000)
+            results[f"{pages}p/{keyword_count}kw"] = {
+                "p50_ms": round(float(np.percentile(durations, 50)), 2),
+                "mean_ms": round(float(np.mean(durations)), 2),
+                "signature": hashlib.sha256("".join(doc_signature(doc) for doc in docs).encode()).hexdigest()[:16],
+            }
+
+    print(json.dumps({
+        "pipeline": nlp.pipe_names,
+        "load_ms": round(load_ms, 1),
+        "rss_before_load_mb": rss_before,
+        "peak_rss_mb": max_rss_mb(),
+        "cases": results,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--exclude", nargs="+", default=["ner", "lemmatizer"])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10])
+    parser.add_argument("--jd-keywords", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args)
+        return
+
+    report = {}
+    for variant in VARIANTS:
+        command = [sys.executable, os.path.abspath(__file__), "--variant", variant, "--model", args.model,
+                   "--repeat", str(args.repeat), "--batch-size", str(args.batch_size),
+                   "--exclude", *args.exclude, "--pages", *map(str, args.pages),
+                   "--jd-keywords", *map(str, args.jd_keywords)]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        report[variant] = json.loads(output.strip().splitlines()[-1])
+
+    signatures = {variant: {case: row["signature"] for case, row in data["cases"].items()}
+                  for variant, data in report.items()}
+    report["identical_parses"] = all(signatures[variant] == signatures["full"] for variant in VARIANTS)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    for variant in VARIANTS:
+        data = report[variant]
+        print(f"{variant:<14} pipeline={','.join(data['pipeline'])}  load {data['load_ms']} ms  "
+              f"peak RSS {data['peak_rss_mb']} MB")
+    print(f"\n{'case':<14}" + "".join(f"{variant + ' (ms)':>20}" for variant in VARIANTS))
+    for case in report["full"]["cases"]:
+        print(f"{case:<14}" + "".join(f"{report[variant]['cases'][case]['p50_ms']:>20}" for variant in VARIANTS))
+    print(f"\nIdentical noun chunks and POS tags across variants: {report['identical_parses']}")
+
+
+if __name__ == "__main__":
+    main()
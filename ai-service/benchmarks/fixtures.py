@@ -0,0 +1,150 @@
+"""
+Deterministic synthetic resumes and job descriptions for the benchmarks.
+
+Resumes are built page by page (about LINES_PER_PAGE lines each) with the
+sections the format checks and structured-data extraction look for, and are
+rendered as DOCX (python-docx) or PDF (a minimal hand-written PDF, so no PDF
+library is needed). Job descriptions list a requested number of distinct skill
+phrases. The same seed always yields the same bytes.
+"""
+import io
+import random
+
+from docx import Document
+
+LINES_PER_PAGE = 45
+
+ADJECTIVES = [
+    "distributed", "cloud", "data", "machine", "frontend", "backend", "mobile", "embedded", "realtime",
+    "scalable", "secure", "automated", "relational", "graph", "streaming", "serverless", "statistical",
+    "predictive", "interactive", "financial", "clinical", "network", "container", "search", "payment",
+    "identity", "observability", "compliance", "analytics", "geospatial", "audio", "video", "robotic",
+    "quantum", "edge", "hybrid", "batch", "event", "semantic", "customer",
+]
+NOUNS = [
+    "systems", "pipelines", "services", "platforms", "models", "dashboards", "architecture", "databases",
+    "infrastructure", "applications", "interfaces", "workflows", "frameworks", "algorithms", "storage",
+    "orchestration", "monitoring", "testing", "deployment", "integration", "migration", "optimization",
+    "security", "design", "governance", "visualization", "processing", "modeling", "automation", "caching",
+    "messaging", "scheduling", "routing", "indexing", "forecasting", "reporting", "tooling", "compilers",
+    "networking", "provisioning", "replication", "encryption", "authentication", "recommendation",
+    "personalization", "experimentation", "annotation", "inference", "training", "evaluation",
+]
+TOOLS = [
+    "Python", "Java", "Go", "Rust", "TypeScript", "React", "Django", "Flask", "Kubernetes", "Docker",
+    "Terraform", "AWS", "GCP", "Azure", "PostgreSQL", "Redis", "Kafka", "Spark", "Airflow", "TensorFlow",
+]
+VERBS = ["Developed", "Built", "Led", "Designed", "Implemented", "Optimized", "Managed", "Created", "Improved"]
+
+
+def skill_phrases(count, rng):
+    """`count` distinct two-word skill phrases (up to len(ADJECTIVES) * len(NOUNS))."""
+    phrases = [f"{adjective} {noun}" for adjective in ADJECTIVES for noun in NOUNS]
+    if count > len(phrases):
+        raise ValueError(f"At most {len(phrases)} distinct skill phrases are available")
+    rng.shuffle(phrases)
+    return phrases[:count]
+
+
+def resume_lines(pages, seed=0):
+    """Plain-text lines of a synthetic resume of about `pages` pages."""
+    rng = random.Random(seed)
+    skills = skill_phrases(min(40 * pages, len(ADJECTIVES) * len(NOUNS)), rng)
+    lines = [
+        "Jordan Example",
+        "jordan.example@example.com | +1 555 010 2030 | linkedin.com/in/jordan-example | github.com/jordan-example",
+        "",
+        "Summary",
+        f"Software engineer with {rng.randint(3, 15)} years of experience in {skills[0]} and {skills[1]}.",
+        "",
+        "Experience",
+    ]
+    target = pages * LINES_PER_PAGE - 14
+    year = 2024
+    while len(lines) < target:
+        lines.append(f"Senior Engineer, Example Corp {rng.randint(1, 99)} ({year - 2} - {year})")
+        year -= 2
+        for _ in range(6):
+            verb = rng.choice(VERBS)
+            first, second = rng.sample(skills, 2)
+            tool = rng.choice(TOOLS)
+            lines.append(f"- {verb} {first} and {second} with {tool}, "
+                         f"improving throughput by {rng.randint(5, 80)}% for {rng.randint(2, 500)} customers.")
+    lines += [
+        "",
+        "Education",
+        "Bachelor of Science in Computer Science, Example University (2012)",
+        "",
+        "Skills",
+        ", ".join(rng.sample(TOOLS, 8)),
+        ", ".join(skills[:12]),
+        "",
+        "Certifications",
+        "AWS Certified Solutions Architect",
+        "Certified Kubernetes Administrator",
+    ]
+    return lines
+
+
+def job_description_text(keyword_count, seed=0):
+    """A job description that asks for `keyword_count` distinct skill phrases."""
+    rng = random.Random(seed + 1)
+    skills = skill_phrases(keyword_count, rng)
+    sentences = ["We are hiring a senior software engineer to join our platform team."]
+    for start in range(0, len(skills), 4):
+        group = skills[start:start + 4]
+        listed = ", ".join(group[:-1]) + (" and " if len(group) > 1 else "") + group[-1]
+        sentences.append(f"You have hands-on experience with {listed}.")
+    sentences.append(f"Experience with {', '.join(rng.sample(TOOLS, 5))} is a plus.")
+    return " ".join(sentences)
+
+
+def docx_bytes(lines):
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def pdf_bytes(lines):
+    """Renders lines as a minimal multi-page PDF with one Helvetica text block per page."""
+    pages = [lines[start:start + LINES_PER_PAGE] for start in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % pid for pid in page_ids)
+           + b"] /Count %d >>" % len(pages),
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_id, page_lines in zip(page_ids, pages):
+        text = [b"BT /F1 10 Tf 12 TL 50 790 Td"]
+        for line in page_lines:
+            escaped = line.encode("latin-1", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+            text.append(b"(" + escaped + b") Tj T*")
+        text.append(b"ET")
+        stream = b"\n".join(text)
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1))
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = output.tell()
+        output.write(b"%d 0 obj\n" % number + objects[number] + b"\nendobj\n")
+    xref_offset = output.tell()
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for number in sorted(objects):
+        output.write(b"%010d 00000 n \n" % offsets[number])
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+    return output.getvalue()
+
+
+def resume_document(pages, file_format, seed=0):
+    """Synthetic resume bytes in 'pdf' or 'docx' format."""
+    lines = resume_lines(pages, seed)
+    return pdf_bytes(lines) if file_format == "pdf" else docx_bytes(lines)
@@ -0,0 +1,320 @@
+import os
+import time
+import pickle
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with optional TTL (seconds) and hit/miss counters."""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class SQLiteStore:
+    """
+    Pickled key/value store in a local SQLite file.
+    Uses WAL mode and one connection per thread, so it can be shared by
+    several worker processes on the same machine. With max_bytes set, the
+    least recently used entries are evicted once the stored values exceed it.
+    """
+
+    def __init__(self, path, table="cache", ttl=None, max_bytes=None):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        # SQLite connections must not cross a fork (e.g. gunicorn preload), so reconnect per process
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        """Returns a dict with the entries found for the given keys."""
+        found = {}
+        keys = list(keys)
+        conn = self._connection()
+        oldest = time.time() - self.ttl if self.ttl else 0
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value FROM {self.table} WHERE key IN ({placeholders}) AND created_at >= ?",
+                chunk + [oldest],
+            ).fetchall()
+            for key, value in rows:
+                found[key] = pickle.loads(value)
+        if found and self.max_bytes:
+            # Track recency so size-based eviction drops the least recently used entries
+            now = time.time()
+            with conn:
+                conn.executemany(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                )
+        return found
+
+    def set(self, key, value):
+        self.set_many([(key, value)])
+
+    def set_many(self, items):
+        now = time.time()
+        rows = []
+        for key, value in items:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, blob, len(blob), now, now))
+        if not rows:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            if self.max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn):
+        """Deletes expired entries, then least recently used ones until under max_bytes."""
+        self._purge_expired(conn)
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+
+    def purge_expired(self):
+        """Deletes entries older than the TTL (no-op without a TTL)."""
+        with self._connection() as conn:
+            self._purge_expired(conn)
+
+    def _purge_expired(self, conn):
+        if self.ttl:
+            conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def __len__(self):
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """
+    Bounded in-process LRU (with optional TTL) backed by an optional SQLite
+    file, so entries computed by one worker can be served by the others.
+    """
+
+    def __init__(self, maxsize=512, ttl=None, path=None, table="cache", max_bytes=None):
+        self.memory = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.disk = SQLiteStore(path, table=table, ttl=ttl, max_bytes=max_bytes) if path else None
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logging.warning(f"Cache read failed: {e}")
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+                with self._lock:
+                    self.disk_hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                logging.warning(f"Cache write failed: {e}")
+
+    def stats(self):
+        hits = self.memory.hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_size": len(self.memory),
+            "memory_maxsize": self.memory.maxsize,
+            "memory_hits": self.memory.hits,
+            "disk_enabled": self.disk is not None,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def hash_bytes(*parts):
+    """SHA-256 hex digest over one or more byte/str parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(part)
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def normalize_phrase(text):
+    """Lowercases a phrase and collapses whitespace so equivalent phrases share a cache key."""
+    return " ".join(str(text).lower().split())
+
+
+class EmbeddingCache:
+    """
+    Caches Sentence-BERT embeddings of keyword phrases, keyed by model name and
+    normalized phrase. Lookups go to the in-process LRU first, then to the
+    optional on-disk store; only phrases missing from both are encoded.
+    """
+
+    def __init__(self, model_name, maxsize=20000, path=None):
+        self.model_name = model_name
+        self.memory = LRUCache(maxsize=maxsize)
+        self.disk = SQLiteStore(path, table="embeddings") if path else None
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, phrase):
+        return f"{self.model_name}\x00{phrase}"
+
+    def encode(self, texts, model):
+        """Returns an (n, dim) float32 array of embeddings for texts, in order."""
+        phrases = [normalize_phrase(text) for text in texts]
+        if not phrases:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        vectors = {}
+        pending = []
+        for phrase in dict.fromkeys(phrases):
+            vector = self.memory.get(self._key(phrase))
+            if vector is None:
+                pending.append(phrase)
+            else:
+                vectors[phrase] = vector
+
+        if pending and self.disk is not None:
+            try:
+                stored = self.disk.get_many([self._key(phrase) for phrase in pending])
+            except sqlite3.Error as e:
+                logging.warning(f"Embedding cache read failed: {e}")
+                stored = {}
+            still_pending = []
+            for phrase in pending:
+                vector = stored.get(self._key(phrase))
+                if vector is None:
+                    still_pending.append(phrase)
+                else:
+                    vectors[phrase] = vector
+                    self.memory.set(self._key(phrase), vector)
+            with self._lock:
+                self.disk_hits += len(pending) - len(still_pending)
+            pending = still_pending
+
+        if pending:
+            encoded = np.asarray(model.encode(pending, convert_to_tensor=False), dtype=np.float32)
+            for phrase, vector in zip(pending, encoded):
+                vectors[phrase] = vector
+                self.memory.set(self._key(phrase), vector)
+            if self.disk is not None:
+                try:
+                    self.disk.set_many((self._key(phrase), vectors[phrase]) for phrase in pending)
+                except sqlite3.Error as e:
+                    logging.warning(f"Embedding cache write failed: {e}")
+            with self._lock:
+                self.misses += len(pending)
+
+        return np.stack([vectors[phrase] for phrase in phrases])
+
+    def stats(self):
+        return {
+            "model": self.model_name,
+            "memory_size": len(self.memory),
+            "memory_maxsize": self.memory.maxsize,
+            "memory_hits": self.memory.hits,
+            "disk_enabled": self.disk is not None,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
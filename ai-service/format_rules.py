@@ -0,0 +1,261 @@
+import re
+import json
+import time
+import threading
+from functools import cached_property
+
+from sections import SECTION_KEYWORDS, SectionSegmenter
+
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+YEAR_PATTERN = re.compile(r'\b(19|20)\d{2}\b')
+MONTH_YEAR_PATTERN = re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(19|20)\d{2}\b')
+
+# Points deducted per issue, by rule category
+CATEGORY_PENALTIES = {
+    "contact": 10,
+    "sections": 15,
+    "content": 8,
+    "formatting": 5,
+    "length": 12,
+}
+
+# Keywords whose presence anywhere in the text satisfies each missing-section check
+SECTION_CHECK_KEYWORDS = {
+    "experience": ['experience', 'work experience', 'employment', 'professional experience'],
+    "education": ['education', 'academic background', 'qualifications'],
+    "skills": ['skills', 'technical skills', 'competencies', 'technologies'],
+    "summary": ['summary', 'objective', 'profile', 'about'],
+}
+SECTION_SEGMENTER = SectionSegmenter(SECTION_KEYWORDS)
+
+
+class ParsedResume:
+    """
+    Shared view of a resume's text for the format rules and structured-data parsing.
+    The lowercased text, lines, words and section map are computed at most once, on
+    first use.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    @cached_property
+    def stripped_lines(self):
+        return [line.strip() for line in self.lines]
+
+    @cached_property
+    def words(self):
+        return self.text.split()
+
+    @cached_property
+    def sections(self):
+        return SECTION_SEGMENTER.segment(self.lower)
+
+
+class FormatRule:
+    """
+    One format check. `check(view)` returns the issue message, or None if the rule passes.
+    Issues deduct `penalty` points (the category default unless given).
+    """
+
+    def __init__(self, name, category, check, penalty=None):
+        self.name = name
+        self.category = category
+        self.check = check
+        self.penalty = CATEGORY_PENALTIES.get(category, 5) if penalty is None else penalty
+
+
+class PatternRule(FormatRule):
+    """
+    Regex rule: reports `message` when none of the patterns match (when="missing")
+    or when any of them does (when="present"). Patterns are compiled once and run
+    on the original text (source="text") or the lowercased text (source="lower").
+    """
+
+    def __init__(self, name, category, message, patterns, when="missing", source="text", flags=0, penalty=None):
+        self.message = message
+        self.patterns = [re.compile(pattern, flags) for pattern in patterns]
+        self.when = when
+        self.source = source
+        super().__init__(name, category, self._check, penalty)
+
+    def _check(self, view):
+        text = view.lower if self.source == "lower" else view.text
+        found = any(pattern.search(text) for pattern in self.patterns)
+        return self.message if found == (self.when == "present") else None
+
+
+def section_rule(name, category, message, section):
+    """Missing-section rule: issue if none of the section's check keywords occurs in the text."""
+    keywords = SECTION_CHECK_KEYWORDS[section]
+    return FormatRule(name, category, lambda view: None if view.sections.mentions_any(keywords) else message)
+
+
+FIRST_PERSON_PATTERN = re.compile(r'\bi\b')
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+
+
+def check_first_person(view):
+    i_count = len(FIRST_PERSON_PATTERN.findall(view.lower))
+    total_sentences = len(SENTENCE_END_PATTERN.findall(view.text))
+    if total_sentences > 0 and i_count / total_sentences > 0.1:
+        return "Avoid first-person pronouns (I, me, my) - use active voice instead"
+    return None
+
+
+def check_capitalization(view):
+    uncapitalized_lines = sum(1 for line in view.stripped_lines if len(line) > 3 and line[0].islower())
+    if uncapitalized_lines > len(view.lines) * 0.2:  # More than 20% of lines
+        return "Inconsistent capitalization - ensure proper sentence case"
+    return None
+
+
+def check_word_count(view):
+    word_count = len(view.words)
+    if word_count < 200:
+        return "Resume appears too short - add more detail about your experience"
+    if word_count > 1000:
+        return "Resume may be too long - consider condensing to 1-2 pages"
+    return None
+
+
+def check_long_lines(view):
+    long_lines = sum(1 for line in view.lines if len(line) > 100)
+    if long_lines > len(view.lines) * 0.3:
+        return "Some lines are too long - break into shorter, readable chunks"
+    return None
+
+
+def check_empty_lines(view):
+    empty_lines = sum(1 for line in view.stripped_lines if not line)
+    if empty_lines > len(view.lines) * 0.4:
+        return "Too many empty lines - optimize spacing for better readability"
+    return None
+
+
+def default_rules(find_action_verbs):
+    """The built-in checks, in report order. find_action_verbs(text) returns the action verbs used."""
+    def check_action_verbs(view):
+        if len(find_action_verbs(view.lower)) < 3:
+            return "Use more action verbs to describe accomplishments"
+        return None
+
+    return [
+        # 1. Contact information
+        PatternRule("email", "contact", "Missing email address", [EMAIL_PATTERN.pattern]),
+        PatternRule("phone", "contact", "Missing or improperly formatted phone number", [
+            r'\(\+\d{1,3}\)\s\d{2}\s\d{7}',  # International format
+            r'\+?\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
+            r'\+?\d{1,3}[-.\s]?\d{3,4}[-.\s]?\d{3,4}[-.\s]?\d{3,4}',  # International
+            r'\+\d{1,9}\s\d{9}',
+        ]),
+        PatternRule("linkedin", "contact", "Consider adding LinkedIn profile", [
+            r'linkedin\.com/in/[\w-]+',
+            r'linkedin\.com/pub/[\w-]+',
+            r'www\.linkedin\.com',
+        ], source="lower"),
+        # 2. Section structure
+        section_rule("experience_section", "sections", "Missing Experience section", "experience"),
+        section_rule("education_section", "sections", "Missing Education section", "education"),
+        section_rule("skills_section", "sections", "Missing Skills section", "skills"),
+        section_rule("summary_section", "sections", "Consider adding a professional summary or objective", "summary"),
+        # 3. Content quality
+        PatternRule("employment_dates", "content", "Missing employment dates - add start and end dates for positions", [
+            YEAR_PATTERN.pattern,  # Years
+            MONTH_YEAR_PATTERN.pattern,  # Month Year
+            r'\b\d{1,2}/\d{4}\b',  # MM/YYYY
+        ], source="lower"),
+        FormatRule("action_verbs", "content", check_action_verbs),
+        # 4. Professional formatting
+        FormatRule("first_person", "formatting", check_first_person),
+        FormatRule("capitalization", "formatting", check_capitalization),
+        PatternRule("excessive_punctuation", "formatting", "Remove excessive punctuation marks",
+                    [r'[!]{2,}|[?]{2,}|[.]{3,}'], when="present"),
+        # 5. Length and structure
+        FormatRule("word_count", "length", check_word_count),
+        FormatRule("long_lines", "length", check_long_lines),
+        FormatRule("empty_lines", "length", check_empty_lines),
+    ]
+
+
+def load_pattern_rules(path):
+    """
+    Reads extra regex rules from a JSON list of objects with name, category, message
+    and patterns, plus optional when ("missing"/"present"), source ("text"/"lower"),
+    ignore_case and penalty.
+    """
+    with open(path, encoding="utf-8") as f:
+        specs = json.load(f)
+    return [
+        PatternRule(
+            spec["name"], spec.get("category", "formatting"), spec["message"], spec["patterns"],
+            when=spec.get("when", "missing"), source=spec.get("source", "text"),
+            flags=re.IGNORECASE if spec.get("ignore_case") else 0, penalty=spec.get("penalty"),
+        )
+        for spec in specs
+    ]
+
+
+class FormatRuleEngine:
+    """Runs the rules over one shared ParsedResume and keeps per-rule call counts and time."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate format rule names: {', '.join(duplicates)}")
+        self._stats = {rule.name: {"calls": 0, "issues": 0, "seconds": 0.0} for rule in self.rules}
+        self._lock = threading.Lock()
+
+    def check(self, view):
+        format_issues = []
+        format_score = 100  # Start with perfect score, deduct points for issues
+        elapsed = {}
+        for rule in self.rules:
+            start = time.perf_counter()
+            issue = rule.check(view)
+            elapsed[rule.name] = (time.perf_counter() - start, issue is not None)
+            if issue:
+                format_issues.append(issue)
+                format_score -= rule.penalty
+
+        with self._lock:
+            for name, (seconds, failed) in elapsed.items():
+                stats = self._stats[name]
+                stats["calls"] += 1
+                stats["issues"] += failed
+                stats["seconds"] += seconds
+
+        return {
+            "format_score": max(0, format_score),
+            "format_issues": format_issues,
+            "total_issues": len(format_issues)
+        }
+
+    def stats(self):
+        """Per-rule call count, issues raised and time spent (ms), in rule order."""
+        report = []
+        with self._lock:
+            for rule in self.rules:
+                stats = self._stats[rule.name]
+                total_ms = stats["seconds"] * 1000
+                report.append({
+                    "name": rule.name,
+                    "category": rule.category,
+                    "penalty": rule.penalty,
+                    "calls": stats["calls"],
+                    "issues": stats["issues"],
+                    "total_ms": round(total_ms, 3),
+                    "mean_ms": round(total_ms / stats["calls"], 4) if stats["calls"] else 0.0,
+                })
+        return report
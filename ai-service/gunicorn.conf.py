@@ -0,0 +1,53 @@
+"""
+Production entry point for the AI service:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app (spaCy and Sentence-BERT included) is loaded once in the master process
+and the workers are forked from it, so model weights are shared copy-on-write
+instead of being loaded once per worker: MODEL_WARMUP defaults to 1 here. With
+MODEL_WARMUP=background the app is not preloaded; each worker starts serving at
+once and loads its own models in a background thread (see /ready).
+
+Each worker runs ANALYSIS_CONCURRENCY analyses at a time (default 1, with one
+math-library thread each), queues up to ANALYSIS_QUEUE_SIZE more and answers 503
+with Retry-After beyond that.
+"""
+import gc
+import os
+import multiprocessing
+
+# One BLAS/torch thread per analysis; parallelism comes from the worker processes.
+# These must be set before the app (and torch) is imported by preload_app.
+for _variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_variable, "1")
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+os.environ.setdefault("MODEL_WARMUP", "1")
+
+bind = os.environ.get("AI_SERVICE_BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+preload_app = os.environ["MODEL_WARMUP"] != "background"
+
+# Threads per worker: the running analyses plus the bounded queue, plus one spare
+# so health checks and 503 answers are not stuck behind a full queue.
+worker_class = "gthread"
+threads = (
+    int(os.environ.get("ANALYSIS_CONCURRENCY", "1"))
+    + int(os.environ.get("ANALYSIS_QUEUE_SIZE", "4"))
+    + 1
+)
+
+timeout = int(os.environ.get("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+# Recycle workers now and then to bound memory growth from fragmentation
+max_requests = int(os.environ.get("WORKER_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+
+def when_ready(server):
+    # Move everything allocated while preloading (models included) out of the
+    # garbage collector's view, so collections in the workers don't touch and
+    # un-share those pages.
+    if preload_app:
+        gc.freeze()
+        server.log.info("Models preloaded; forking %s workers", workers)
@@ -0,0 +1,105 @@
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from admission import ServiceOverloaded
+
+
+class JobManager:
+    """
+    Runs analyses in a background thread pool and keeps their status, per-stage
+    timings and results in a store with expiry (a SQLiteStore shared by all
+    workers), so a job can be polled through any worker process.
+    """
+
+    def __init__(self, store, max_workers=1, max_pending=32):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        # Threads start lazily on the first submit, i.e. in the worker after any fork
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queues func(*args, timings=..., **kwargs) and returns a copy of the new job record.
+        Raises ServiceOverloaded when this worker already has max_pending jobs.
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise ServiceOverloaded()
+            self.pending += 1
+            queue_depth = self.pending
+
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "created_at": now,
+            "updated_at": now,
+            "queue_depth": queue_depth,
+            "timings": {},
+            "result": None,
+            "error": None,
+            "error_status": None,
+        }
+        # The worker thread updates `job` in place; the caller gets the record as queued
+        submitted = dict(job, timings={})
+        try:
+            self.store.purge_expired()
+            self.store.set(job["id"], job)
+            self._executor.submit(self._run, job, func, args, kwargs)
+        except Exception:
+            with self._lock:
+                self.pending -= 1
+            raise
+        return submitted
+
+    def _run(self, job, func, args, kwargs):
+        started = time.time()
+        job.update(status="running", updated_at=started)
+        job["timings"]["queue_wait"] = round((started - job["created_at"]) * 1000, 2)
+        self._save(job)
+
+        timings = job["timings"]
+        try:
+            job["result"] = func(*args, timings=timings, **kwargs)
+            job["status"] = "done"
+        except Exception as e:
+            logging.error(f"Analysis job {job['id']} failed: {e}", exc_info=True)
+            job["status"] = "failed"
+            job["error"] = getattr(e, "message", None) or f"An error occurred during processing: {str(e)}"
+            job["error_status"] = getattr(e, "status", 500)
+        finally:
+            job["timings"]["total"] = round((time.time() - started) * 1000, 2)
+            job["updated_at"] = time.time()
+            with self._lock:
+                self.pending -= 1
+                if job["status"] == "done":
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            self._save(job)
+
+    def _save(self, job):
+        try:
+            self.store.set(job["id"], job)
+        except Exception as e:
+            logging.error(f"Could not store analysis job {job['id']}: {e}")
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def stats(self):
+        return {
+            "queue_depth": self.pending,
+            "max_pending": self.max_pending,
+            "workers": self.max_workers,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
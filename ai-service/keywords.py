@@ -0,0 +1,139 @@
+import re
+from collections import Counter
+
+# Leading words of a noun chunk that only qualify it ("the", "our", "3", "strong python skills")
+EDGE_POS = frozenset(["DET", "PRON", "NUM", "PUNCT", "SYM", "CCONJ", "PART", "ADP"])
+# Adjectives that praise or quantify a skill rather than name it. Other adjectives are kept,
+# since many are part of the skill ("distributed systems", "deep learning", "relational databases")
+FILLER_ADJECTIVES = frozenset([
+    "strong", "excellent", "good", "great", "solid", "proven", "extensive", "exceptional", "outstanding",
+    "effective", "successful", "demonstrated", "thorough", "broad", "relevant", "related", "similar",
+    "various", "multiple", "different", "additional", "key", "preferred", "required", "ideal",
+    "basic", "professional", "practical", "new",
+])
+PLURAL_TAGS = frozenset(["NNS", "NNPS"])
+DIGIT_PATTERN = re.compile(r'\d')
+
+
+def singular(word):
+    """Conservative singular of an English plural noun ("technologies" -> "technology", "processes" -> "process")."""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+class KeywordCanonicalizer:
+    """
+    Turns the keyword candidates of one parsed (lowercased) Doc into fewer, canonical keywords.
+
+    The candidates are the ones keyword extraction has always used: noun chunks,
+    nouns and proper nouns, and skill taxonomy mentions. Then:
+    - a skill mention becomes the skill's canonical name ("react.js" -> "react"),
+    - a noun chunk that contains a skill mention is subsumed by that skill
+      ("strong python skills", "python developer" -> "python"),
+    - other noun chunks lose leading determiners, pronouns, numbers and filler
+      adjectives ("our proven track record" -> "track record"),
+    - plural nouns are lemmatized ("databases" -> "database"), with the Doc's lemmas
+      if the pipeline has a lemmatizer and a suffix rule on plural-tagged tokens otherwise.
+    Keywords are ranked by salience (skills first, then by mentions, then by first
+    mention), and cap() keeps at most max_keywords of them (0 keeps all of them).
+
+    `get_taxonomy` returns the SkillTaxonomy, so the taxonomy can be loaded lazily.
+    """
+
+    def __init__(self, get_taxonomy, max_keywords=0):
+        self.get_taxonomy = get_taxonomy
+        self.max_keywords = max_keywords
+        self._skill_keywords = None
+
+    @property
+    def skill_keywords(self):
+        """Canonical keywords of all taxonomy skills."""
+        if self._skill_keywords is None:
+            self._skill_keywords = frozenset(name.lower() for name in self.get_taxonomy().skills)
+        return self._skill_keywords
+
+    def keywords(self, doc):
+        """
+        (canonical keywords, most salient first; raw candidates), where the raw candidates
+        are the distinct keywords extraction returns without this stage. Use cap() to keep
+        the max_keywords most salient ones.
+        """
+        taxonomy = self.get_taxonomy()
+        excluded_keywords = taxonomy.excluded_keywords
+        lemmas = doc.has_annotation("LEMMA")
+        mentions = Counter()
+        first_mention = {}
+        skills = set()
+        raw = set()
+
+        def add(keyword, position, surface=None):
+            if keyword in excluded_keywords or (surface or keyword) in excluded_keywords:
+                return
+            if len(keyword) <= 1 or DIGIT_PATTERN.search(keyword):
+                return
+            mentions[keyword] += 1
+            first_mention.setdefault(keyword, position)
+
+        # Character ranges of skill mentions: the taxonomy may tokenize the text differently
+        skill_ranges = []
+        for span, name in taxonomy.find_skill_spans(doc):
+            raw.add(span.text)
+            skill_ranges.append((span.start_char, span.end_char))
+            skills.add(name.lower())
+            add(name.lower(), span.start_char)
+
+        def in_skill(token):
+            return any(start <= token.idx < end for start, end in skill_ranges)
+
+        for chunk in doc.noun_chunks:
+            raw.add(chunk.text)
+            if any(in_skill(token) for token in chunk):
+                continue
+            tokens = list(chunk)
+            while tokens and (tokens[0].pos_ in EDGE_POS or tokens[0].is_stop or tokens[0].text in FILLER_ADJECTIVES):
+                tokens.pop(0)
+            while tokens and tokens[-1].pos_ in EDGE_POS:
+                tokens.pop()
+            if tokens:
+                words = [token.text_with_ws for token in tokens[:-1]] + [self._lemma(tokens[-1], lemmas)]
+                add("".join(words), tokens[0].idx, chunk.text)
+
+        for token in doc:
+            if token.pos_ in ["NOUN", "PROPN"] and len(token.text) > 2 and not token.is_stop and token.is_alpha:
+                raw.add(token.text)
+                if not in_skill(token):
+                    add(self._lemma(token, lemmas), token.idx, token.text)
+
+        raw = {
+            keyword for keyword in raw
+            if keyword not in excluded_keywords and len(keyword) > 1 and not DIGIT_PATTERN.search(keyword)
+        }
+        ranked = sorted(mentions, key=lambda keyword: (keyword not in skills, -mentions[keyword], first_mention[keyword]))
+        return ranked, raw
+
+    def merge(self, keyword_lists):
+        """
+        One document's keywords from the canonical keywords of its parts (e.g. the
+        paragraphs of a resume), ranked by skills first, then by the number of parts
+        that mention them, then by first mention (not capped).
+        """
+        parts = Counter(keyword for keywords in keyword_lists for keyword in keywords)
+        first_mention = {}
+        for keyword in (keyword for keywords in keyword_lists for keyword in keywords):
+            first_mention.setdefault(keyword, len(first_mention))
+        skills = self.skill_keywords
+        return sorted(parts, key=lambda keyword: (keyword not in skills, -parts[keyword], first_mention[keyword]))
+
+    def cap(self, keywords):
+        return keywords[:self.max_keywords] if self.max_keywords else keywords
+
+    @staticmethod
+    def _lemma(token, lemmas):
+        if token.tag_ not in PLURAL_TAGS:
+            return token.text
+        return token.lemma_ if lemmas and token.lemma_ else singular(token.text)
@@ -0,0 +1,60 @@
+import time
+import logging
+import threading
+
+
+class LazyModel:
+    """
+    A model loaded on first use. `loader()` runs at most once, under a lock, however
+    many threads ask at the same time; later calls return the loaded object without
+    locking. If loading fails, the error is kept and get() returns None until
+    load(retry=True) succeeds, so a broken model is not reloaded on every request.
+    """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded = False
+        self.error = None
+        self.load_seconds = None
+
+    @property
+    def loaded(self):
+        return self._loaded and self.error is None
+
+    def get(self):
+        if self._loaded:
+            return self._value
+        return self.load()
+
+    def load(self, retry=False):
+        with self._lock:
+            if self._loaded and not (retry and self.error is not None):
+                return self._value
+            start = time.perf_counter()
+            try:
+                self._value = self._loader()
+                self.error = None
+            except Exception as e:
+                logging.error(f"Error loading {self.name}: {e}")
+                self._value = None
+                self.error = str(e)
+            self.load_seconds = round(time.perf_counter() - start, 3)
+            self._loaded = True
+            return self._value
+
+    def set(self, value):
+        """Replaces the model (e.g. with a stub in benchmarks) without running the loader."""
+        with self._lock:
+            self._value = value
+            self._loaded = True
+            self.error = None
+
+    def status(self):
+        return {
+            "loaded": self.loaded,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
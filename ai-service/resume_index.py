@@ -0,0 +1,332 @@
+import os
+import json
+import logging
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+class ResumeIndex:
+    """
+    On-disk index of analyzed resumes for reverse (JD -> resumes) search, keyed by
+    a stable resume ID.
+
+    Files in the index directory:
+    - documents.f32: one pooled, unit-length vector per resume (float32 rows)
+    - keywords.f32: the normalized keyword embeddings of every resume, concatenated
+    - entries.jsonl: one JSON line per resume with its row, keyword offset/count, keywords and metadata
+
+    The vector files are memory-mapped, so a 100k-resume corpus is scored with a
+    single matrix-vector product without loading it onto the heap. Writers take an
+    exclusive file lock, so several worker processes can write to the same index.
+    New resumes are appended; re-adding or deleting an ID rewrites entries.jsonl
+    without its old lines and zeroes its old vectors, so a removed resume's
+    keywords do not stay on disk. Once more than `compact_ratio` of the keyword rows
+    (and at least `compact_min_rows`) belong to removed resumes, the vector files are
+    rewritten with the live rows only. That moves rows, so searches read inside
+    `reading()`, which holds writers off.
+    """
+
+    def __init__(self, directory, dim=None, compact_ratio=0.5, compact_min_rows=10000):
+        self.directory = directory
+        self.dim = dim
+        self.compact_ratio = compact_ratio
+        self.compact_min_rows = compact_min_rows
+        # Reentrant: add() and delete() refresh while holding it
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._read_offset = 0
+        # entries.jsonl stays open between refreshes: while it is open, its inode cannot be
+        # reused by the file that replaces it, so a changed inode always means a rewrite
+        self._entries_file = None
+        self._inode = None
+        self._matrices_stale = True
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._row_ids = []
+        self._documents = None
+        self._keywords = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _file_lock(self):
+        return _FileLock(self._path(".lock"))
+
+    def reading(self):
+        """
+        Shared lock on the index files for the duration of a search: rows found by
+        candidates() stay where keyword_embeddings() reads them.
+        """
+        return _FileLock(self._path(".lock"), shared=True)
+
+    def __len__(self):
+        self.refresh()
+        return len(self._entries)
+
+    def refresh(self):
+        """Reads entries written since the last refresh (by this or another process)."""
+        entries_path = self._path("entries.jsonl")
+        try:
+            stat = os.stat(entries_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino == self._inode and stat.st_size == self._read_offset:
+            return
+        with self._lock:
+            if self._entries_file is None or os.stat(entries_path).st_ino != self._inode:
+                # New or rewritten by _remove() or compaction: read it again from the start
+                self._close_entries_file()
+                self._entries_file = open(entries_path, "rb")
+                self._inode = os.fstat(self._entries_file.fileno()).st_ino
+                self._entries = {}
+                self._read_offset = 0
+                self._matrices_stale = True
+            self._entries_file.seek(self._read_offset)
+            chunk = self._entries_file.read()
+            # Only consume complete lines; a line still being written is picked up next time
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            for line in complete.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logging.warning("Skipping unreadable resume index entry")
+                    continue
+                self._entries[entry["id"]] = entry
+                self.dim = entry["dim"]
+            if complete:
+                self._read_offset += len(complete)
+                self._matrices_stale = True
+
+    def _close_entries_file(self):
+        if self._entries_file is not None:
+            self._entries_file.close()
+            self._entries_file = None
+        self._inode = None
+
+    def _load_matrices(self):
+        """Remaps the vector files and rebuilds the live-row table after new entries."""
+        self.refresh()
+        with self._lock:
+            if not self._matrices_stale:
+                return
+            self._row_ids = list(self._entries)
+            self._rows = np.array([self._entries[resume_id]["row"] for resume_id in self._row_ids], dtype=np.int64)
+            self._documents = self._map("documents.f32")
+            self._keywords = self._map("keywords.f32")
+            self._matrices_stale = False
+
+    def _map(self, name):
+        path = self._path(name)
+        if not self.dim or not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        rows = os.path.getsize(path) // (4 * self.dim)
+        return np.memmap(path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def get(self, resume_id):
+        self.refresh()
+        return self._entries.get(resume_id)
+
+    def add(self, resume_id, keywords, embeddings, metadata=None):
+        """
+        Adds a resume's keywords and normalized keyword embeddings to the index,
+        replacing any earlier entry of the same ID. Re-adding an ID with the same
+        content_hash in its metadata is a no-op. Returns True if an entry was written.
+        """
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if not keywords or embeddings.ndim != 2 or len(embeddings) != len(keywords):
+            return False
+        metadata = metadata or {}
+        dim = embeddings.shape[1]
+
+        # Pooled document vector: mean of the unit-length keyword vectors, re-normalized
+        pooled = embeddings.mean(axis=0)
+        norm = np.linalg.norm(pooled)
+        if norm > 0:
+            pooled = pooled / norm
+
+        # The file lock is taken before the thread lock, as in reading()
+        with self._file_lock(), self._lock:
+            # Checked under the locks, so concurrent adds of one ID never both append
+            self.refresh()
+            existing = self._entries.get(resume_id)
+            if existing and metadata.get("content_hash") and existing["metadata"].get("content_hash") == metadata["content_hash"]:
+                return False
+            if self.dim and dim != self.dim:
+                raise ValueError(f"Embedding dimension {dim} does not match index dimension {self.dim}")
+
+            replaced = existing is not None and self._remove(resume_id)
+            documents_path = self._path("documents.f32")
+            keywords_path = self._path("keywords.f32")
+            row = os.path.getsize(documents_path) // (4 * dim) if os.path.exists(documents_path) else 0
+            keyword_offset = os.path.getsize(keywords_path) // (4 * dim) if os.path.exists(keywords_path) else 0
+
+            with open(keywords_path, "ab") as f:
+                f.write(embeddings.tobytes())
+            with open(documents_path, "ab") as f:
+                f.write(pooled.astype(np.float32).tobytes())
+            # The entry line is written last, so readers never see rows without an entry
+            entry = {
+                "id": resume_id,
+                "row": row,
+                "keyword_offset": keyword_offset,
+                "keyword_count": len(keywords),
+                "dim": dim,
+                "keywords": list(keywords),
+                "metadata": metadata,
+            }
+            with open(self._path("entries.jsonl"), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            if replaced:
+                self._compact_if_sparse()
+        return True
+
+    def delete(self, resume_id):
+        """Removes a resume from the index. Returns True if it was indexed."""
+        with self._file_lock(), self._lock:
+            if not self._remove(resume_id):
+                return False
+            self._compact_if_sparse()
+            return True
+
+    def _remove(self, resume_id):
+        """
+        Rewrites entries.jsonl without the lines of `resume_id` and zeroes their
+        vectors. Callers hold both locks. Other readers notice the new file on
+        their next refresh.
+        """
+        entries_path = self._path("entries.jsonl")
+        if not os.path.exists(entries_path):
+            return False
+        kept = []
+        removed = []
+        with open(entries_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    entry = None
+                if entry and entry["id"] == resume_id:
+                    removed.append(entry)
+                else:
+                    kept.append(line)
+        if not removed:
+            return False
+
+        for name, start, count in (("documents.f32", "row", None), ("keywords.f32", "keyword_offset", "keyword_count")):
+            with open(self._path(name), "r+b") as f:
+                for entry in removed:
+                    f.seek(entry[start] * 4 * entry["dim"])
+                    f.write(bytes(4 * entry["dim"] * (entry[count] if count else 1)))
+
+        temporary_path = entries_path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            f.writelines(kept)
+        # Read back on the next refresh; closed first, as Windows cannot replace an open file
+        self._close_entries_file()
+        os.replace(temporary_path, entries_path)
+        return True
+
+    def _compact_if_sparse(self):
+        """
+        Rewrites documents.f32 and keywords.f32 with only the rows of live entries,
+        renumbering them in a new entries.jsonl, once removed resumes hold more than
+        compact_ratio of the keyword rows. Callers hold both locks. The vector files are
+        replaced before entries.jsonl, so entries never point past the new files.
+        Returns True if the files were compacted.
+        """
+        keywords_path = self._path("keywords.f32")
+        entries = []
+        with open(self._path("entries.jsonl"), "rb") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        if not entries or not os.path.exists(keywords_path):
+            return False
+        dim = entries[0]["dim"]
+        total_rows = os.path.getsize(keywords_path) // (4 * dim)
+        dead_rows = total_rows - sum(entry["keyword_count"] for entry in entries)
+        if dead_rows < self.compact_min_rows or dead_rows <= total_rows * self.compact_ratio:
+            return False
+
+        try:
+            documents = np.memmap(self._path("documents.f32"), dtype=np.float32, mode="r").reshape(-1, dim)
+            keywords = np.memmap(keywords_path, dtype=np.float32, mode="r").reshape(-1, dim)
+            with open(self._path("documents.f32.tmp"), "wb") as documents_file, \
+                    open(self._path("keywords.f32.tmp"), "wb") as keywords_file:
+                keyword_offset = 0
+                for row, entry in enumerate(entries):
+                    documents_file.write(documents[entry["row"]].tobytes())
+                    start = entry["keyword_offset"]
+                    keywords_file.write(keywords[start:start + entry["keyword_count"]].tobytes())
+                    entry["row"] = row
+                    entry["keyword_offset"] = keyword_offset
+                    keyword_offset += entry["keyword_count"]
+            del documents, keywords
+            with open(self._path("entries.jsonl.tmp"), "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            self._close_entries_file()
+            os.replace(self._path("documents.f32.tmp"), self._path("documents.f32"))
+            os.replace(self._path("keywords.f32.tmp"), keywords_path)
+            os.replace(self._path("entries.jsonl.tmp"), self._path("entries.jsonl"))
+        except (OSError, ValueError) as e:
+            # The index stays valid uncompacted; the next removal tries again
+            logging.warning(f"Could not compact resume index: {e}")
+            return False
+        logging.info(f"Compacted resume index: dropped {dead_rows} of {total_rows} keyword rows")
+        return True
+
+    def candidates(self, query_vector, limit):
+        """
+        Scores every resume's pooled vector against a unit-length query vector and
+        returns up to `limit` (entry, pooled_score) pairs, best first. Call it inside
+        reading() together with keyword_embeddings().
+        """
+        with self._lock:
+            self._load_matrices()
+            if self._documents is None or not len(self._rows):
+                return []
+            query_vector = np.asarray(query_vector, dtype=np.float32)
+            # Score the whole mapped matrix in one product, then keep the live rows
+            scores = (self._documents @ query_vector)[self._rows]
+            limit = min(limit, len(scores))
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            top = top[np.argsort(-scores[top])]
+            return [(self._entries[self._row_ids[i]], float(scores[i])) for i in top]
+
+    def keyword_embeddings(self, entry):
+        """Returns the stored (keyword_count, dim) embedding block of an entry from candidates()."""
+        with self._lock:
+            self._load_matrices()
+            start = entry["keyword_offset"]
+            return np.array(self._keywords[start:start + entry["keyword_count"]])
+
+
+class _FileLock:
+    """Exclusive (or shared) advisory lock on a file (no-op where fcntl is unavailable)."""
+
+    def __init__(self, path, shared=False):
+        self.path = path
+        self.shared = shared
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        return False
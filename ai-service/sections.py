@@ -0,0 +1,75 @@
+import re
+
+# Keywords that open each section read by the structured-data extractors, in priority
+# order: the first keyword that occurs followed by a colon or whitespace wins
+SECTION_KEYWORDS = {
+    "education": ["education", "academic background"],
+    "experience": ["experience", "work experience", "employment"],
+    "skills": ["skills", "technical skills", "competencies"],
+    "certifications": ["certifications", "certificates", "qualifications"],
+}
+
+SEPARATOR_PATTERN = re.compile(r'[:\s]+')
+# A section runs until the next blank line (or the end of the text)
+BLANK_LINE_PATTERN = re.compile(r'\n\s*\n')
+
+
+class SectionMap:
+    """
+    Where each section of one lowercased resume text is. `spans` maps a section name
+    to the (start, end) offsets of its content in the lowercased text. Keyword
+    lookups for the missing-section checks are answered once and remembered.
+    """
+
+    def __init__(self, lower, spans):
+        self.lower = lower
+        self.spans = spans
+        self._mentioned = {}
+
+    def section(self, name):
+        """The section's content (lowercased and stripped), or "" if it was not found."""
+        span = self.spans.get(name)
+        return self.lower[span[0]:span[1]].strip() if span else ""
+
+    def mentions(self, keyword):
+        if keyword not in self._mentioned:
+            self._mentioned[keyword] = keyword in self.lower
+        return self._mentioned[keyword]
+
+    def mentions_any(self, keywords):
+        return any(self.mentions(keyword) for keyword in keywords)
+
+
+class SectionSegmenter:
+    """
+    Locates the sections of a resume once, for every extractor and check that needs them.
+
+    For each section, the keywords are looked up in priority order in the lowercased
+    text (the first occurrence followed by a colon or whitespace, with a precompiled
+    literal-prefix pattern) until one is found; the section's content starts after
+    the keyword and separator and ends at the next blank line. This gives the same
+    content as `re.search(keyword + r'[:\\s]+(.*?)(?=\\n\\s*\\n|\\Z)', lower, re.DOTALL)`
+    per keyword, without a lowercase copy and a lazy regex scan per lookup. Every
+    search stops at its first hit, so the cost is linear in the text.
+    """
+
+    def __init__(self, sections=SECTION_KEYWORDS):
+        self.sections = {name: list(keywords) for name, keywords in sections.items()}
+        self._headings = {
+            keyword: re.compile(re.escape(keyword) + r'[:\s]')
+            for keywords in self.sections.values() for keyword in keywords
+        }
+
+    def segment(self, lower):
+        """SectionMap of a lowercased resume text."""
+        spans = {}
+        for name, keywords in self.sections.items():
+            for keyword in keywords:
+                heading = self._headings[keyword].search(lower)
+                if heading is None:
+                    continue
+                start = SEPARATOR_PATTERN.match(lower, heading.start() + len(keyword)).end()
+                blank_line = BLANK_LINE_PATTERN.search(lower, start)
+                spans[name] = (start, blank_line.start() if blank_line else len(lower))
+                break
+        return SectionMap(lower, spans)
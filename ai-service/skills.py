@@ -0,0 +1,95 @@
+import re
+import json
+
+import spacy
+from spacy.tokens import Doc
+from spacy.matcher import PhraseMatcher
+from spacy.util import filter_spans
+
+
+class SkillTaxonomy:
+    """
+    Skill dictionary (canonical names with aliases), action verbs and excluded
+    keywords, compiled once into spaCy PhraseMatchers.
+
+    Phrases are tokenized with the given pipeline's tokenizer (a blank English one
+    by default), so a Doc that pipeline already parsed is matched without another
+    pass, and a plain string costs one tokenizer pass plus one matcher pass,
+    however many entries the taxonomy has. Phrases only match on whole tokens
+    ("git" does not match inside "digital"). Phrases listed as ambiguous for an
+    entry (e.g. "go", "spring") are common words and only match when
+    include_ambiguous is set, e.g. inside a resume's skills section.
+    Action verbs are single words and are looked up in the text's word set.
+    """
+
+    def __init__(self, skills, action_verbs=(), excluded_keywords=(), nlp=None):
+        if nlp is None:
+            nlp = spacy.blank("en")
+            nlp.max_length = 10 ** 8  # The tokenizer alone has no per-character memory cost
+        self.nlp = nlp
+        self.skills = {}
+        self.categories = {}
+        self._matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self._ambiguous_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+
+        for skill in skills:
+            name = skill["name"]
+            ambiguous = {phrase.lower() for phrase in skill.get("ambiguous", [])}
+            phrases = {phrase.lower() for phrase in [name] + list(skill.get("aliases", []))}
+            self.skills[name] = sorted(phrases)
+            self.categories[name] = skill.get("category")
+            clear = [self.nlp.make_doc(phrase) for phrase in sorted(phrases - ambiguous)]
+            unclear = [self.nlp.make_doc(phrase) for phrase in sorted(phrases & ambiguous)]
+            if clear:
+                self._matcher.add(name, clear)
+            if unclear:
+                self._ambiguous_matcher.add(name, unclear)
+
+        self.action_verbs = frozenset(verb.lower() for verb in action_verbs)
+        self.excluded_keywords = frozenset(keyword.lower() for keyword in excluded_keywords)
+
+    @classmethod
+    def load(cls, path, nlp=None):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("skills", []), data.get("action_verbs", []), data.get("excluded_keywords", []), nlp)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def _doc(self, text):
+        # Docs from another pipeline's vocab are re-tokenized with ours
+        if isinstance(text, Doc) and text.vocab is self.nlp.vocab:
+            return text
+        return self.nlp.make_doc(getattr(text, "text", text))
+
+    def find_skills(self, text, include_ambiguous=False):
+        """
+        Skill mentions in a text or parsed Doc as (surface text, canonical name) pairs,
+        in text order. Overlapping mentions resolve to the longest one ("react native" over "react").
+        """
+        return [(span.text, name) for span, name in self.find_skill_spans(text, include_ambiguous)]
+
+    def find_skill_spans(self, text, include_ambiguous=False):
+        """find_skills as (Span, canonical name) pairs; span character offsets are offsets into text."""
+        if not len(text):
+            return []
+        doc = self._doc(text)
+        matches = self._matcher(doc)
+        if include_ambiguous:
+            matches += self._ambiguous_matcher(doc)
+        spans = [doc[start:end] for _, start, end in matches]
+        labels = {(start, end): self.nlp.vocab.strings[match_id] for match_id, start, end in matches}
+        return [(span, labels[(span.start, span.end)]) for span in sorted(filter_spans(spans), key=lambda s: s.start)]
+
+    def skill_names(self, text, include_ambiguous=False):
+        """Canonical names of the skills mentioned in text, without duplicates, in text order."""
+        names = (name for _, name in self.find_skills(text, include_ambiguous))
+        return list(dict.fromkeys(names))
+
+    def find_action_verbs(self, text):
+        """The distinct action verbs used in text (lowercased)."""
+        return self.action_verbs.intersection(re.findall(r"[a-z]+", text.lower()))
+
+    def is_excluded(self, keyword):
+        return keyword.lower() in self.excluded_keywords
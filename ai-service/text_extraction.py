@@ -0,0 +1,396 @@
+import io
+import re
+import time
+import logging
+import zipfile
+import weakref
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from importlib.util import find_spec
+from xml.etree import ElementTree
+
+# Parsers are imported on first use, so importing this module (and the app) stays fast.
+# pypdfium2 and PyMuPDF (fitz) are optional faster PDF backends, used when installed.
+
+# Neither PDFium nor MuPDF may be used from several threads at once
+_pdfium_lock = threading.Lock()
+_mupdf_lock = threading.Lock()
+
+
+def available_pdf_backends():
+    """Installed PDF backends, fastest first."""
+    backends = []
+    if find_spec("pypdfium2") is not None:
+        backends.append("pypdfium2")
+    if find_spec("fitz") is not None:
+        backends.append("pymupdf")
+    backends.append("pdfminer")
+    return backends
+
+
+def resolve_pdf_backends(preference="auto"):
+    """Backends to try in order for a PDF_BACKEND setting; pdfminer is always the last resort."""
+    available = available_pdf_backends()
+    if preference in ("", "auto"):
+        return available
+    if preference not in available:
+        logging.warning(f"PDF backend '{preference}' is not installed; using {available[0]}")
+        return available
+    return [preference] + [name for name in available if name != preference]
+
+
+def _pdfminer_pages(data):
+    """Yields pdfminer page texts lazily (same output per page as pdfminer's extract_text)."""
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    try:
+        document = PDFDocument(PDFParser(io.BytesIO(data)))
+        total_pages = resolve1(document.catalog["Pages"]).get("Count")
+    except Exception as e:
+        # No usable page tree (or a broken one): extract_text finds the pages its own way
+        logging.warning(f"PDF page count not resolved ({e}); extracting the whole document at once")
+        return None, _pdfminer_whole_document(data)
+
+    def pages():
+        resource_manager = PDFResourceManager(caching=True)
+        output = io.StringIO()
+        device = TextConverter(resource_manager, output, codec="utf-8", laparams=LAParams())
+        interpreter = PDFPageInterpreter(resource_manager, device)
+        try:
+            for page in PDFPage.create_pages(document):
+                interpreter.process_page(page)
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+        finally:
+            device.close()
+
+    return total_pages, pages()
+
+
+def _pdfminer_whole_document(data):
+    from pdfminer.high_level import extract_text
+
+    yield extract_text(io.BytesIO(data))
+
+
+def _pdfium_pages(data):
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(data)
+
+    def pages():
+        try:
+            for index in range(len(document)):
+                page = document[index]
+                text_page = page.get_textpage()
+                try:
+                    yield text_page.get_text_range() + "\f"
+                finally:
+                    text_page.close()
+                    page.close()
+        finally:
+            document.close()
+
+    return len(document), pages()
+
+
+def _mupdf_pages(data):
+    import fitz
+
+    document = fitz.open(stream=data, filetype="pdf")
+
+    def pages():
+        try:
+            for index in range(document.page_count):
+                yield document.load_page(index).get_text() + "\f"
+        finally:
+            document.close()
+
+    return document.page_count, pages()
+
+
+PDF_BACKENDS = {
+    "pypdfium2": (_pdfium_pages, _pdfium_lock),
+    "pymupdf": (_mupdf_pages, _mupdf_lock),
+    "pdfminer": (_pdfminer_pages, None),
+}
+
+
+def extract_pdf_text(data, max_pages=None, max_chars=None, timeout=None, backends=("pdfminer",)):
+    """
+    Extracts text page by page, stopping at the first exhausted budget: max_pages,
+    max_chars or timeout (seconds of wall-clock time, checked between pages).
+    Backends are tried in order; if one fails, the next one starts over.
+
+    Returns a dict with text, backend, pages (pages read), total_pages and
+    truncated (None, "max_pages", "max_chars" or "timeout").
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    last_error = None
+    for backend in backends:
+        open_pages, lock = PDF_BACKENDS[backend]
+        try:
+            if lock is None:
+                return _read_pages(open_pages, data, backend, max_pages, max_chars, deadline)
+            with lock:
+                return _read_pages(open_pages, data, backend, max_pages, max_chars, deadline)
+        except Exception as e:
+            logging.warning(f"PDF backend {backend} failed: {e}")
+            last_error = e
+    raise last_error
+
+
+def _read_pages(open_pages, data, backend, max_pages, max_chars, deadline):
+    total_pages, pages = open_pages(data)
+    parts = []
+    chars = 0
+    pages_read = 0
+    truncated = None
+    try:
+        for page_text in pages:
+            parts.append(page_text)
+            chars += len(page_text)
+            pages_read += 1
+            if max_chars and chars >= max_chars:
+                truncated = "max_chars" if chars > max_chars or pages_read < (total_pages or 0) else None
+                break
+            if max_pages and pages_read >= max_pages:
+                truncated = "max_pages" if pages_read < (total_pages or 0) else None
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                truncated = "timeout" if pages_read < (total_pages or 0) else None
+                break
+    finally:
+        pages.close()
+
+    text = "".join(parts)
+    return {
+        "text": text[:max_chars] if max_chars else text,
+        "backend": backend,
+        "pages": pages_read,
+        "total_pages": total_pages,
+        "truncated": truncated,
+    }
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = WORD_NAMESPACE + "p"
+_TEXT = WORD_NAMESPACE + "t"
+_TAB = WORD_NAMESPACE + "tab"
+_BREAKS = frozenset([WORD_NAMESPACE + "br", WORD_NAMESPACE + "cr"])
+_HYPHEN = WORD_NAMESPACE + "noBreakHyphen"
+# Subtrees without body text: paragraph properties (their w:tab elements are tab stops) and the
+# VML copy of text boxes that Word writes next to the DrawingML one for older readers
+_SKIPPED = frozenset([
+    WORD_NAMESPACE + "pPr",
+    "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback",
+])
+DOCX_HEADER_FOOTER_PATTERN = re.compile(r'word/(header|footer)(\d*)\.xml')
+
+
+def _ooxml_paragraphs(stream):
+    """
+    Yields the text of every paragraph in one WordprocessingML part (document, header
+    or footer), in document order: body paragraphs, the paragraphs of table cells
+    row by row, and the paragraphs of text boxes (before the paragraph anchoring them).
+
+    The part is parsed incrementally and every element is dropped once its parent's
+    next child ends, so memory stays flat however long the document is.
+    """
+    open_elements = []
+    paragraphs = []  # Run texts of the open paragraphs; text boxes nest paragraphs in paragraphs
+    skipping = 0
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            open_elements.append(element)
+            if tag in _SKIPPED:
+                skipping += 1
+            elif tag == _PARAGRAPH and not skipping:
+                paragraphs.append([])
+            continue
+
+        open_elements.pop()
+        if tag in _SKIPPED:
+            skipping -= 1
+        elif skipping or not paragraphs:
+            pass
+        elif tag == _TEXT:
+            paragraphs[-1].append(element.text or "")
+        elif tag == _TAB:
+            paragraphs[-1].append("\t")
+        elif tag in _BREAKS:
+            paragraphs[-1].append("\n")
+        elif tag == _HYPHEN:
+            paragraphs[-1].append("-")
+        elif tag == _PARAGRAPH:
+            yield "".join(paragraphs.pop())
+        if open_elements:
+            open_elements[-1].clear()
+
+
+def _docx_parts(package):
+    """WordprocessingML parts with text, in reading order: headers, the document, footers."""
+    names = package.namelist()
+    parts = {"header": [], "footer": []}
+    for name in names:
+        match = DOCX_HEADER_FOOTER_PATTERN.fullmatch(name)
+        if match:
+            parts[match.group(1)].append((int(match.group(2) or 0), name))
+    return [name for _, name in sorted(parts["header"])] + ["word/document.xml"] + [name for _, name in sorted(parts["footer"])]
+
+
+def _ooxml_stream_text(data, max_chars=None):
+    """
+    Text of a DOCX read straight from its zip package, one line per paragraph. Only the
+    document, header and footer XML parts are decompressed, as streams, so embedded
+    media is never read. A header or footer repeated in several parts (first page,
+    even pages) is kept once. Stops after max_chars characters.
+    """
+    lines = []
+    chars = 0
+    truncated = None
+    seen_parts = set()
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        for name in _docx_parts(package):
+            with package.open(name) as stream:
+                part_lines = []
+                for paragraph in _ooxml_paragraphs(stream):
+                    part_lines.append(paragraph)
+                    chars += len(paragraph) + 1
+                    if max_chars and chars > max_chars:
+                        truncated = "max_chars"
+                        break
+            part_text = "\n".join(part_lines)
+            if name != "word/document.xml":
+                if not part_text.strip() or part_text in seen_parts:
+                    continue
+                seen_parts.add(part_text)
+            lines.extend(part_lines)
+            if truncated:
+                break
+    text = "\n".join(lines)
+    return (text[:max_chars] if max_chars else text), truncated
+
+
+def extract_docx_text(data, max_chars=None):
+    """
+    Extracts DOCX text with the streaming OOXML reader (paragraphs, tables, text boxes,
+    headers and footers); python-docx (body paragraphs only) is the fallback for
+    packages the reader cannot parse.
+    """
+    try:
+        text, truncated = _ooxml_stream_text(data, max_chars)
+        backend = "ooxml-stream"
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        logging.warning(f"Streaming DOCX reader failed: {e}; falling back to python-docx")
+        from docx import Document
+
+        document = Document(io.BytesIO(data))
+        text = "\n".join([paragraph.text for paragraph in document.paragraphs])
+        truncated = "max_chars" if max_chars and len(text) > max_chars else None
+        text = text[:max_chars] if max_chars else text
+        backend = "python-docx"
+    return {
+        "text": text,
+        "backend": backend,
+        "pages": None,
+        "total_pages": None,
+        "truncated": truncated,
+    }
+
+
+def extract_document_text(data, file_extension, max_pages=None, max_chars=None, timeout=None, backends=("pdfminer",)):
+    """
+    Text and extraction info for PDF or DOCX bytes (see extract_pdf_text).
+    Plain module-level function, so it can run in a worker process.
+    """
+    if file_extension == ".pdf":
+        return extract_pdf_text(data, max_pages, max_chars, timeout, backends)
+    if file_extension == ".docx":
+        return extract_docx_text(data, max_chars)
+    raise ValueError(f"Unsupported file type: {file_extension}")
+
+
+class _TrackingContext:
+    """A multiprocessing context that remembers the worker processes it starts, so they can be terminated."""
+
+    def __init__(self, context):
+        self._context = context
+        self.processes = weakref.WeakSet()
+
+    def Process(self, *args, **kwargs):
+        process = self._context.Process(*args, **kwargs)
+        self.processes.add(process)
+        return process
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+
+class ExtractionPool:
+    """
+    Worker processes for text extraction, started on first use and replaced after a
+    crash. run() gives a call a hard wall-clock limit: a parser stuck in native code
+    (a pathological page, a huge object stream) cannot be interrupted, so once the
+    limit passes the workers are terminated. Other calls running on the same workers
+    then fail with BrokenProcessPool; run() retries those once on fresh workers.
+
+    Workers are started with forkserver (spawn where it is unavailable), never forked
+    from the calling process, which may be running threads and hold the loaded models.
+    """
+
+    def __init__(self, max_workers, start_method=None):
+        self.max_workers = max_workers
+        self.start_method = start_method or (
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        self._executor = None
+        self._contexts = weakref.WeakKeyDictionary()  # executor -> _TrackingContext
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._executor is None:
+                context = _TrackingContext(multiprocessing.get_context(self.start_method))
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                self._contexts[self._executor] = context
+            return self._executor
+
+    def reset(self, executor):
+        """Drops a broken executor (unless it was already replaced); the next get() starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def kill(self, executor):
+        """Terminates the executor's worker processes and drops it."""
+        context = self._contexts.get(executor)
+        for process in list(context.processes if context else ()):
+            if process.is_alive():
+                process.terminate()
+        self.reset(executor)
+
+    def run(self, time_limit, fn, /, *args, **kwargs):
+        """fn(*args, **kwargs) in a worker process; raises concurrent.futures.TimeoutError after time_limit seconds."""
+        for attempt in range(2):
+            executor = self.get()
+            try:
+                return executor.submit(fn, *args, **kwargs).result(timeout=time_limit)
+            except FutureTimeoutError:
+                self.kill(executor)
+                raise
+            except BrokenProcessPool:
+                self.reset(executor)
+                if attempt:
+                    raise
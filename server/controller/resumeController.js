@@ -1,4 +1,5 @@
 import Resume from "../model/Resume.js";
+import mongoose from "mongoose";
 import fs from "fs";
 import axios from "axios";
 import FormData from "form-data";
@@ -14,6 +15,8 @@ export async function analyzeResume(req, res) {
 
   try {
     let analysis;
+    // Chosen up front so the AI service indexes the resume under the same ID
+    const resumeId = new mongoose.Types.ObjectId();
 
     try {
       const fileBuffer = fs.readFileSync(req.file.path);
@@ -24,6 +27,11 @@ export async function analyzeResume(req, res) {
         contentType: req.file.mimetype,
       });
       formData.append("jobDescription", req.body.jobDescription);
+      formData.append("resumeId", resumeId.toString());
+      // Lets the AI service reuse the unchanged parts of an edited resume
+      if (req.body.previousAnalysisId) {
+        formData.append("previousAnalysisId", req.body.previousAnalysisId);
+      }
 
       const response = await axios.post(
         "http://localhost:5001/analyze-resume-jd",
@@ -54,6 +62,7 @@ export async function analyzeResume(req, res) {
     }
 
     const resume = await Resume.create({
+      _id: resumeId,
       owner: req.user._id,
       fileOriginalName: req.file.originalname,
       fileName: req.file.filename,
@@ -61,6 +70,7 @@ export async function analyzeResume(req, res) {
       analysis: analysis.structured || {},
       matchScore: analysis.matchScore || 0,
       feedback: analysis.feedback || "Analysis completed",
+      analysisId: analysis.analysisId,
     });
 
     // Clean up uploaded file
@@ -73,6 +83,7 @@ export async function analyzeResume(req, res) {
     return res.status(200).json({
       message: "Analysis completed successfully",
       id: resume._id,
+      analysisId: analysis.analysisId,
       analysis: analysis.structured || {},
       matchScore: analysis.matchScore || 0,
     });
@@ -98,6 +109,132 @@ export async function analyzeResume(req, res) {
   }
 }
 
+// Parses a newline-delimited JSON stream, yielding each record as soon as its line is complete
+async function* readNdjson(stream) {
+  stream.setEncoding("utf8");
+  let buffered = "";
+  for await (const chunk of stream) {
+    buffered += chunk;
+    let newline;
+    while ((newline = buffered.indexOf("\n")) !== -1) {
+      const line = buffered.slice(0, newline).trim();
+      buffered = buffered.slice(newline + 1);
+      if (line) yield JSON.parse(line);
+    }
+  }
+  if (buffered.trim()) yield JSON.parse(buffered);
+}
+
+export async function analyzeResumesBulk(req, res) {
+  if (!req.files?.length || !req.body.jobDescription) {
+    return res.status(400).json({
+      error: !req.files?.length
+        ? "No resume files provided"
+        : "No job description provided",
+    });
+  }
+
+  let upstream;
+  try {
+    // One ID per upload, in order, so the AI service indexes each resume under
+    // the ID it is saved with (files inside a ZIP archive get IDs derived from the archive's)
+    const resumeIds = req.files.map(() => new mongoose.Types.ObjectId());
+    const formData = new FormData();
+    req.files.forEach((file, i) => {
+      formData.append("resumes", fs.createReadStream(file.path), {
+        filename: file.originalname,
+        contentType: file.mimetype,
+      });
+      formData.append("resumeIds", resumeIds[i].toString());
+    });
+    formData.append("jobDescription", req.body.jobDescription);
+
+    // The AI service streams one NDJSON record per resume as it finishes;
+    // each one is saved and forwarded right away instead of waiting for the batch
+    const response = await axios.post(
+      "http://localhost:5001/analyze-resume-jd-bulk",
+      formData,
+      {
+        headers: {
+          ...formData.getHeaders(),
+          Accept: "application/x-ndjson",
+        },
+        responseType: "stream",
+        maxBodyLength: Infinity,
+        maxContentLength: Infinity,
+      }
+    );
+    upstream = response.data;
+
+    // Stop the analysis if the client goes away
+    res.on("close", () => {
+      if (!res.writableEnded) upstream.destroy();
+    });
+
+    res.status(200);
+    res.setHeader("Content-Type", "application/x-ndjson");
+    res.setHeader("Cache-Control", "no-cache");
+    res.flushHeaders();
+
+    for await (const record of readNdjson(upstream)) {
+      if (record.status !== "ok") {
+        res.write(JSON.stringify(record) + "\n");
+        continue;
+      }
+
+      // Records point back to their upload by position: file names can repeat
+      const analysis = record.result;
+      const resume = await Resume.create({
+        _id: record.resumeId || new mongoose.Types.ObjectId(),
+        owner: req.user._id,
+        fileOriginalName: record.filename,
+        fileName: req.files[record.upload]?.filename || record.filename,
+        jobDescription: req.body.jobDescription,
+        analysis: analysis.structured || {},
+        matchScore: analysis.matchScore || 0,
+        feedback: analysis.feedback || "Analysis completed",
+        analysisId: analysis.analysisId,
+      });
+
+      res.write(
+        JSON.stringify({
+          index: record.index,
+          filename: record.filename,
+          status: "ok",
+          id: resume._id,
+          analysisId: analysis.analysisId,
+          analysis: analysis.structured || {},
+          matchScore: analysis.matchScore || 0,
+        }) + "\n"
+      );
+    }
+    res.end();
+  } catch (err) {
+    console.error("Bulk analysis error:", err);
+    upstream?.destroy();
+
+    if (!res.headersSent) {
+      res.status(500).json({
+        error: "Bulk analysis failed: " + err.message,
+        details: err.message,
+      });
+    } else if (!res.writableEnded) {
+      res.end(
+        JSON.stringify({ status: "error", error: "Bulk analysis failed: " + err.message }) + "\n"
+      );
+    }
+  } finally {
+    // Clean up uploaded files
+    for (const file of req.files) {
+      try {
+        fs.unlinkSync(file.path);
+      } catch (cleanupError) {
+        console.warn("Failed to cleanup uploaded file:", cleanupError.message);
+      }
+    }
+  }
+}
+
 export async function getResumeById(req, res) {
   try {
     const { id } = req.params;
@@ -277,6 +414,15 @@ export async function deleteResume(req, res) {
 
     await Resume.deleteOne({ _id: id });
 
+    // Drop it from the AI service's resume index too (404 when it was never indexed)
+    try {
+      await axios.delete(`http://localhost:5001/resume-index/resumes/${id}`);
+    } catch (aiError) {
+      if (aiError.response?.status !== 404) {
+        console.warn("Failed to remove resume from the AI index:", aiError.message);
+      }
+    }
+
     return res.status(200).json({
       success: true,
       message: "Resume deleted successfully",
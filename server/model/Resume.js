@@ -39,6 +39,8 @@ const ResumeSchema = new mongoose.Schema({
     type: String,
     default: "",
   },
+  // AI service analysis ID, sent back as previousAnalysisId when an edited resume is re-uploaded
+  analysisId: String,
   createdAt: {
     type: Date,
     default: Date.now,
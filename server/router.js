@@ -14,6 +14,7 @@ import {
 import { protect } from "./middleware/auth.js";
 import {
   analyzeResume,
+  analyzeResumesBulk,
   getResumeById,
   getAllResumesByUser,
   getUserResumeStats,
@@ -32,6 +33,12 @@ const storage = multer.diskStorage({
 const upload = multer({ storage: storage });
 
 router.post("/resume/analyze", protect, upload.single("resume"), analyzeResume);
+router.post(
+  "/resumes/analyze-bulk",
+  protect,
+  upload.array("resumes", 500),
+  analyzeResumesBulk
+);
 router.get("/resume/:id", protect, getResumeById);
 router.get("/resumes", protect, getAllResumesByUser);
 router.get("/resumes/stats", protect, getUserResumeStats);